@@ -0,0 +1,140 @@
+"""
+Async front end for DatabaseManager, for `async def` handlers.
+
+All queries run on one dedicated thread that owns a single sqlite3
+connection, so awaiting a query never takes a Starlette threadpool slot
+and SQLite sees one writer instead of a connection per request.
+"""
+import asyncio
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from app.database import DatabaseManager
+
+
+class _ConnectionOwningDatabase(DatabaseManager):
+    """DatabaseManager that reuses one long-lived connection instead of opening one per call."""
+
+    def __init__(self, db_path: str):
+        # The schema is already set up by the synchronous DatabaseManager
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = super().get_connection()
+            # WAL lets readers on other connections proceed while this thread writes
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class AsyncDatabaseManager:
+    """Same operations as DatabaseManager, awaitable from the event loop."""
+
+    def __init__(self, db_path: str = 'care_catalyst.db'):
+        """
+        Initializes (and if needed migrates) the database, then starts the
+        thread that owns the connection.
+        :param db_path: Path to the SQLite database file.
+        """
+        DatabaseManager(db_path)
+        self.db_path = db_path
+        self._db = _ConnectionOwningDatabase(db_path)
+        self._jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._worker, name='sqlite-worker', daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            loop, future, fn, args = job
+            try:
+                result, error = fn(*args), None
+            except BaseException as e:
+                result, error = None, e
+            loop.call_soon_threadsafe(self._resolve, future, result, error)
+        self._db.close()
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run(self, fn: Callable, *args) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._jobs.put((loop, future, fn, args))
+        return future
+
+    async def close(self):
+        """Stops the worker thread once queued queries have run."""
+        self._jobs.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+
+    async def create_user(self, user_data: Dict[str, Any]) -> Optional[int]:
+        """Creates a new user and returns their ID."""
+        return await self._run(self._db.create_user, user_data)
+
+    async def get_user_by_email(self, email: str) -> Optional[sqlite3.Row]:
+        """Retrieves a user by their email address."""
+        return await self._run(self._db.get_user_by_email, email)
+
+    async def get_user_by_id(self, user_id: int) -> Optional[sqlite3.Row]:
+        """Retrieves a user by their ID."""
+        return await self._run(self._db.get_user_by_id, user_id)
+
+    async def get_user_version(self, user_id: int) -> Optional[str]:
+        """Returns the user's updated_at, a cheap version for conditional profile reads."""
+        return await self._run(self._db.get_user_version, user_id)
+
+    async def save_assessment(self, assessment_data: Dict[str, Any]) -> Optional[int]:
+        """Saves assessment results and returns the new assessment ID."""
+        return await self._run(self._db.save_assessment, assessment_data)
+
+    async def get_assessment(self, assessment_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a specific assessment for a user."""
+        return await self._run(self._db.get_assessment, assessment_id, user_id)
+
+    async def get_user_assessments(self, user_id: int) -> List[Dict[str, Any]]:
+        """Retrieves all assessments for a specific user."""
+        return await self._run(self._db.get_user_assessments, user_id)
+
+    async def get_assessments_version(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Returns {'count', 'latest_id', 'latest_at'} for a user's assessments."""
+        return await self._run(self._db.get_assessments_version, user_id)
+
+    async def find_duplicate_assessment(self, raw_data: Dict[str, Any], user_id: Optional[int] = None) -> Optional[int]:
+        """Returns the ID of the most recent assessment with exactly the same answers."""
+        return await self._run(self._db.find_duplicate_assessment, raw_data, user_id)
+
+    async def get_idempotent_response(self, key: str, scope: str) -> Optional[Dict[str, Any]]:
+        """Returns the unexpired row for an Idempotency-Key, pending or completed."""
+        return await self._run(self._db.get_idempotent_response, key, scope)
+
+    async def claim_idempotency_key(self, key: str, scope: str, request_hash: str,
+                                    lease_seconds: float) -> Optional[bool]:
+        """Inserts a pending row for an Idempotency-Key; False if it is already held."""
+        return await self._run(self._db.claim_idempotency_key, key, scope, request_hash, lease_seconds)
+
+    async def save_idempotent_response(self, key: str, scope: str, request_hash: str, response: Any,
+                                       ttl_seconds: float) -> bool:
+        """Stores the completed response on a claimed Idempotency-Key."""
+        return await self._run(self._db.save_idempotent_response, key, scope, request_hash, response, ttl_seconds)
+
+    async def release_idempotency_key(self, key: str, scope: str) -> bool:
+        """Drops a pending claim after its request failed."""
+        return await self._run(self._db.release_idempotency_key, key, scope)
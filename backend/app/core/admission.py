@@ -0,0 +1,161 @@
+"""
+Admission control for the prediction endpoints.
+
+Each protected endpoint gets an AdmissionController, used as a FastAPI
+dependency. It applies a per-caller token bucket (JWT subject; anonymous
+callers are keyed by client IP with a larger budget, since one address may
+be a whole NAT or proxy), then a global cap on in-flight requests with a bounded wait
+queue. Anything beyond that is rejected immediately with 429 (caller over
+its rate) or 503 (endpoint saturated) and a Retry-After header, so latency
+for admitted requests stays bounded under overload.
+
+Admission runs on the event loop, so queued requests don't hold threadpool
+slots while they wait.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from app.core.security import get_token_subject
+
+# Defaults, overridable per deployment
+RATE_PER_SEC = float(os.environ.get('ADMISSION_RATE_PER_SEC') or 5)
+BURST = int(os.environ.get('ADMISSION_BURST') or 20)
+MAX_IN_FLIGHT = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT') or 8)
+MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE') or 32)
+QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT') or 2.0)
+ANON_RATE_PER_SEC = float(os.environ.get('ADMISSION_ANON_RATE_PER_SEC') or 4 * RATE_PER_SEC)
+ANON_BURST = int(os.environ.get('ADMISSION_ANON_BURST') or 4 * BURST)
+
+# Every controller by endpoint name, for the stats endpoint
+controllers: Dict[str, "AdmissionController"] = {}
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: Dict[str, list] = {}  # key -> [tokens, last refill time]
+
+    def acquire(self, key: str) -> float:
+        """Takes a token for `key`. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = [float(self.burst), now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def _prune(self, now: float):
+        # A bucket that has refilled completely is the same as no bucket
+        full_after = self.burst / self.rate
+        self._buckets = {k: b for k, b in self._buckets.items() if now - b[1] < full_after}
+
+
+class AdmissionController:
+    """Rate limit + in-flight cap + bounded queue for one endpoint."""
+
+    def __init__(self, name: str, rate: float = RATE_PER_SEC, burst: int = BURST, max_in_flight: int = MAX_IN_FLIGHT,
+                 max_queue: int = MAX_QUEUE, queue_timeout: float = QUEUE_TIMEOUT,
+                 anonymous_rate: float = ANON_RATE_PER_SEC, anonymous_burst: int = ANON_BURST):
+        """
+        :param name: Endpoint name used in the stats.
+        :param rate: Sustained requests per second allowed per caller.
+        :param burst: Requests a caller may make at once before being limited.
+        :param anonymous_rate: Sustained requests per second per client IP without a token.
+        :param anonymous_burst: Burst per client IP without a token.
+        :param max_in_flight: Requests executing at the same time, across all callers.
+        :param max_queue: Requests allowed to wait for an execution slot; beyond this they are shed.
+        :param queue_timeout: Longest a request waits for a slot before being shed.
+        """
+        self.name = name
+        self.limiter = TokenBucketLimiter(rate, burst)
+        self.anonymous_limiter = TokenBucketLimiter(anonymous_rate, anonymous_burst)
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self.counts = {'admitted': 0, 'queued': 0, 'rate_limited': 0, 'shed_queue_full': 0, 'shed_timeout': 0}
+        controllers[name] = self
+
+    def stats(self) -> Dict[str, int]:
+        return {'in_flight': self.in_flight, 'waiting': len(self._waiters), **self.counts}
+
+    async def acquire(self, caller: str, anonymous: bool = False):
+        """Admits the request or raises 429/503. Anonymous callers draw on the per-IP buckets."""
+        retry_after = (self.anonymous_limiter if anonymous else self.limiter).acquire(caller)
+        if retry_after:
+            self.counts['rate_limited'] += 1
+            raise HTTPException(status_code=429, detail="Too many requests",
+                                headers={"Retry-After": str(math.ceil(retry_after))})
+
+        if self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            self.counts['admitted'] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.counts['shed_queue_full'] += 1
+            raise self._overloaded()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counts['queued'] += 1
+        try:
+            # release() hands its slot straight to the waiter, in_flight is already counted
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._abandon(waiter)
+                self.counts['shed_timeout'] += 1
+                raise self._overloaded()
+            # The slot arrived just as we timed out; keep it
+        except asyncio.CancelledError:
+            # Client went away: give back the slot if it was already handed over
+            if waiter.done():
+                self.release()
+            else:
+                self._abandon(waiter)
+            raise
+        self.counts['admitted'] += 1
+
+    def _abandon(self, waiter: asyncio.Future):
+        waiter.cancel()
+        self._waiters.remove(waiter)
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _overloaded(self) -> HTTPException:
+        return HTTPException(status_code=503, detail="Service overloaded, retry shortly",
+                             headers={"Retry-After": str(math.ceil(self.queue_timeout))})
+
+    async def __call__(self, request: Request, subject: Optional[str] = Depends(get_token_subject)):
+        if subject:
+            await self.acquire(f"user:{subject}")
+        else:
+            await self.acquire(f"ip:{request.client.host if request.client else 'unknown'}", anonymous=True)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,212 @@
+"""
+Compact integer/BLOB encoding for questionnaire answers.
+
+Category order mirrors the fitted encoders shipped in ``model/``:
+``prakriti_encoder.pkl`` (OneHotEncoder ``categories_``) for the Stage 1
+answers and ``stage2_encoders.pkl`` (LabelEncoder ``classes_``) for the
+Stage 2 patient attributes, so a packed code is also the column/label index
+the models use.
+
+Only payloads made entirely of these fields are packed. The current
+/assessment/submit form (``AssessmentData``: question1, question2, ...)
+does not use them yet, so its rows keep the JSON columns until the form
+sends the questionnaire field names.
+"""
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+# Stage 1: the 20 Prakriti answers, in encoder feature order.
+PRAKRITI_CATEGORIES = {
+    'Body_Frame': ['Heavy, broad', 'Medium, muscular', 'Thin, light'],
+    'Skin_Texture': ['Dry, rough, cold', 'Smooth, moist, thick', 'Warm, oily, reddish'],
+    'Hair_Type': ['Dry, frizzy, brittle', 'Soft, oily, reddish/brown', 'Thick, strong, oily'],
+    'Eyes': ['Large, calm, watery', 'Sharp, intense, reddish', 'Small, dry, dull'],
+    'Sleep_Pattern': ['Deep, prolonged', 'Light, interrupted', 'Moderate'],
+    'Appetite': ['Irregular', 'Slow, steady', 'Strong, frequent hunger'],
+    'Digestion': ['Fast, prone to acidity', 'Slow, sluggish', 'Variable, bloating'],
+    'Sweating': ['Less', 'Moderate, little odor', 'Profuse, with odor'],
+    'Speech_Voice': ['Fast, low pitch', 'Sharp, loud', 'Slow, melodious'],
+    'Energy_Levels': ['High but gets tired fast', 'Steady, consistent', 'Variable, bursts of energy'],
+    'Body_Temperature': ['Cold', 'Cool', 'Warm'],
+    'Weather_Sensitivity': ['Dislikes cold, wind', 'Dislikes damp, cold', 'Dislikes heat'],
+    'Memory': ['Quick grasp, poor retention', 'Sharp memory, good retention', 'Slow learning, excellent retention'],
+    'Motion_Tendencies': ['Purposeful, active', 'Restless, always moving', 'Slow, steady'],
+    'Mindset_Emotion': ['Anger, irritability', 'Calm, possessive', 'Fear, anxiety'],
+    'Elimination_Stool': ['Dry, hard, constipation', 'Loose, frequent', 'Well-formed, slow'],
+    'Sleep_Requirement': ['4–6 hours', '6–7 hours', '8–10 hours'],
+    'Hunger_Onset': ['Irregular', 'Mild, slow hunger', 'Sharp, quick hunger'],
+    'Speech_Pace': ['Fast', 'Measured', 'Slow'],
+    'Weight_Tendency': ['Normal weight', 'Tendency to gain weight', 'Underweight'],
+}
+
+# Stage 2: categorical patient attributes, in LabelEncoder order.
+# 'None' for chronic_conditions was encoded as '0' at training time.
+STAGE2_CATEGORIES = {
+    'prakriti_type': ['Kapha', 'Pitta', 'Vata'],
+    'gender': ['Female', 'Male'],
+    'diet_type': ['Balanced', 'Irregular', 'Junk'],
+    'sleep_quality': ['Average', 'Good', 'Poor'],
+    'stress_level': ['High', 'Low', 'Medium'],
+    'physical_activity': ['Active', 'Moderate', 'Sedentary'],
+    'memory_loss': ['Mild', 'None', 'Severe'],
+    'confusion': ['Often', 'Rare', 'Sometimes'],
+    'language_difficulty': ['Mild', 'No', 'Yes'],
+    'decision_making': ['Indecisive', 'Poor', 'Sharp'],
+    'repetition_behavior': ['No', 'Sometimes', 'Yes'],
+    'social_withdrawal': ['No', 'Sometimes', 'Yes'],
+    'mood_swings': ['No', 'Sometimes', 'Yes'],
+    'chronic_conditions': ['None', 'BP', 'Both', 'Diabetes'],
+    'family_history': ['No', 'Yes'],
+}
+
+# Stage 2 numeric vitals: (field, struct format, scale). bmi is kept to one decimal.
+STAGE2_NUMERIC = [
+    ('age', 'B', 1),
+    ('systolic_bp', 'H', 1),
+    ('blood_sugar', 'H', 1),
+    ('bmi', 'H', 10),
+]
+
+# Prakriti dosha score order, matching the model's label_map.
+DOSHA_ORDER = ['Kapha', 'Pitta', 'Vata']
+
+_NUMERIC_STRUCT = struct.Struct('<' + ''.join(fmt for _, fmt, _ in STAGE2_NUMERIC))
+_NUMERIC_MISSING = {'B': 0xFF, 'H': 0xFFFF}
+
+
+def _layout(categories: Dict[str, list]) -> Dict[str, Tuple[int, int]]:
+    """Bit offset and width per field; the all-ones code marks a missing answer."""
+    layout, offset = {}, 0
+    for field, options in categories.items():
+        width = len(options).bit_length()
+        layout[field] = (offset, width)
+        offset += width
+    return layout
+
+
+PRAKRITI_LAYOUT = _layout(PRAKRITI_CATEGORIES)
+STAGE2_LAYOUT = _layout(STAGE2_CATEGORIES)
+_PRAKRITI_INDEX = {f: {v: i for i, v in enumerate(o)} for f, o in PRAKRITI_CATEGORIES.items()}
+_STAGE2_INDEX = {f: {v: i for i, v in enumerate(o)} for f, o in STAGE2_CATEGORIES.items()}
+
+
+def _pack_bits(data: Dict[str, Any], layout, index) -> Optional[int]:
+    packed = 0
+    for field, (offset, width) in layout.items():
+        if field in data:
+            code = index[field].get(data[field])
+            if code is None:
+                return None
+        else:
+            code = (1 << width) - 1
+        packed |= code << offset
+    return packed
+
+
+def _unpack_bits(packed: int, layout, categories) -> Dict[str, Any]:
+    data = {}
+    for field, (offset, width) in layout.items():
+        code = (packed >> offset) & ((1 << width) - 1)
+        if code < len(categories[field]):
+            data[field] = categories[field][code]
+    return data
+
+
+def pack_prakriti_answers(answers: Dict[str, Any]) -> Optional[int]:
+    """Packs the Prakriti answers into one 40-bit integer, or None if an answer is unknown."""
+    return _pack_bits(answers, PRAKRITI_LAYOUT, _PRAKRITI_INDEX)
+
+
+def unpack_prakriti_answers(packed: int) -> Dict[str, str]:
+    return _unpack_bits(packed, PRAKRITI_LAYOUT, PRAKRITI_CATEGORIES)
+
+
+def pack_patient_attributes(patient: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Packs Stage 2 attributes into an 11-byte BLOB: a 4-byte categorical bit
+    field followed by the numeric vitals. Returns None if a value cannot be
+    round-tripped exactly.
+    """
+    categorical = _pack_bits(patient, STAGE2_LAYOUT, _STAGE2_INDEX)
+    if categorical is None:
+        return None
+
+    numeric = []
+    for field, fmt, scale in STAGE2_NUMERIC:
+        missing = _NUMERIC_MISSING[fmt]
+        if field not in patient:
+            numeric.append(missing)
+            continue
+        value = patient[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if scale == 1 and not isinstance(value, int):
+            return None
+        scaled = round(value * scale)
+        if not 0 <= scaled < missing or scaled / scale != value:
+            return None
+        numeric.append(scaled)
+
+    return struct.pack('<I', categorical) + _NUMERIC_STRUCT.pack(*numeric)
+
+
+def unpack_patient_attributes(blob: bytes) -> Dict[str, Any]:
+    (categorical,) = struct.unpack_from('<I', blob)
+    patient = _unpack_bits(categorical, STAGE2_LAYOUT, STAGE2_CATEGORIES)
+    values = _NUMERIC_STRUCT.unpack_from(blob, 4)
+    for (field, fmt, scale), value in zip(STAGE2_NUMERIC, values):
+        if value != _NUMERIC_MISSING[fmt]:
+            patient[field] = value if scale == 1 else value / scale
+    return patient
+
+
+def encode_assessment(raw_data: Dict[str, Any]) -> Optional[Tuple[Optional[int], Optional[bytes]]]:
+    """
+    Splits raw questionnaire data into (packed Prakriti answers, packed
+    patient attributes). Returns None when the data holds anything the codec
+    cannot represent losslessly, in which case callers keep the JSON form.
+    """
+    if not isinstance(raw_data, dict) or not raw_data:
+        return None
+    prakriti = {k: v for k, v in raw_data.items() if k in PRAKRITI_CATEGORIES}
+    stage2_fields = STAGE2_CATEGORIES.keys() | {f for f, _, _ in STAGE2_NUMERIC}
+    patient = {k: v for k, v in raw_data.items() if k in stage2_fields}
+    if len(prakriti) + len(patient) != len(raw_data):
+        return None
+
+    answers_packed = pack_prakriti_answers(prakriti) if prakriti else None
+    vitals_packed = pack_patient_attributes(patient) if patient else None
+    if (prakriti and answers_packed is None) or (patient and vitals_packed is None):
+        return None
+    return answers_packed, vitals_packed
+
+
+def decode_assessment(answers_packed: Optional[int], vitals_packed: Optional[bytes]) -> Dict[str, Any]:
+    raw_data = {}
+    if answers_packed is not None:
+        raw_data.update(unpack_prakriti_answers(answers_packed))
+    if vitals_packed is not None:
+        raw_data.update(unpack_patient_attributes(vitals_packed))
+    return raw_data
+
+
+def pack_dosha_scores(scores: Dict[str, Any]) -> Optional[bytes]:
+    """Packs {'Kapha', 'Pitta', 'Vata'} integer percentages into 3 bytes."""
+    if not isinstance(scores, dict) or set(scores) != set(DOSHA_ORDER):
+        return None
+    values = [scores[d] for d in DOSHA_ORDER]
+    if not all(isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 100 for v in values):
+        return None
+    return bytes(values)
+
+
+def unpack_dosha_scores(blob: bytes) -> Dict[str, int]:
+    return dict(zip(DOSHA_ORDER, blob))
+
+
+def check_encoder_order(encoder) -> None:
+    """Raises ValueError if a fitted Prakriti OneHotEncoder disagrees with the codec."""
+    fields = list(getattr(encoder, 'feature_names_in_', PRAKRITI_CATEGORIES))
+    for field, categories in zip(fields, encoder.categories_):
+        if PRAKRITI_CATEGORIES.get(field) != list(categories):
+            raise ValueError(f"Encoder categories for '{field}' do not match the answer codec")
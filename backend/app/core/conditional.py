@@ -0,0 +1,70 @@
+"""
+Conditional GET helpers (ETag / Last-Modified) for per-user reads the
+dashboard polls.
+
+Endpoints compute a cheap version for the resource (e.g. the user's
+updated_at, or the latest assessment id) and answer a matching
+If-None-Match / If-Modified-Since with an empty 304 before loading and
+serializing the payload.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+# Per-user data: only the browser may cache it, and it must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*version: Any) -> str:
+    """Weak ETag from the parts that identify a version of the resource."""
+    digest = hashlib.sha1("|".join(str(part) for part in version).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def parse_db_timestamp(value: Any) -> Optional[datetime]:
+    """SQLite CURRENT_TIMESTAMP text (UTC) or a datetime -> aware UTC datetime."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(microsecond=0), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since is only used without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" matches "x"
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        return any((tag[2:] if tag.startswith("W/") else tag) == opaque
+                   for tag in (t.strip() for t in if_none_match.split(",")))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
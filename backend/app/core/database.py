@@ -1,3 +1,5 @@
+from datetime import datetime
+
 class DatabaseManager:
     def __init__(self):
         # Initialize your database connection here
@@ -27,6 +29,11 @@ class DatabaseManager:
         # Find user by ID
         return self.users.get(user_id)
         
+    def get_user_version(self, user_id):
+        # Cheap version of the user's profile for conditional GETs
+        user = self.users.get(user_id)
+        return user["updated_at"] if user else None
+        
     def create_user(self, user_data):
         # Create a new user
         self.user_counter += 1
@@ -37,7 +44,8 @@ class DatabaseManager:
             "id": user_id,
             "email": user_data.get("email"),
             "name": user_data.get("name"),
-            "password_hash": user_data.get("password")
+            "password_hash": user_data.get("password"),
+            "updated_at": datetime.utcnow()
         }
         
         return user_id
\ No newline at end of file
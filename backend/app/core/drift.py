@@ -0,0 +1,222 @@
+"""
+Streaming input drift monitor for the Prakriti questionnaire and the
+Stage 2 patient fields.
+
+Every monitored feature is binned into a fixed set of slots: categorical
+features get one slot per training category plus an "other" slot, numeric
+features get decile bins cut from the training data. Requests only push
+their input onto a bounded queue; a background thread bins it and bumps
+counters in the current time bucket, and a ring of buckets gives a sliding
+window whose totals are kept incrementally. The window is compared with
+the training distribution by PSI and a chi-square test on demand.
+"""
+import bisect
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from app.core.codec import PRAKRITI_CATEGORIES, STAGE2_CATEGORIES, STAGE2_NUMERIC
+from app.core.readiness import readiness
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+BUCKET_SECONDS = float(os.environ.get('DRIFT_BUCKET_SECONDS') or 300)
+WINDOW_BUCKETS = int(os.environ.get('DRIFT_WINDOW_BUCKETS') or 12)
+MIN_SAMPLES = int(os.environ.get('DRIFT_MIN_SAMPLES') or 100)
+PSI_ALERT = 0.2  # common rule of thumb: < 0.1 stable, 0.1-0.2 moderate, > 0.2 significant shift
+MIN_EXPECTED = 5  # chi-square is unreliable for bins expecting fewer observations
+_EPS = 1e-4
+
+
+class _Feature:
+    """Maps one feature's values to slots [offset, offset + bins)."""
+
+    def __init__(self, name: str, offset: int, categories: Optional[list] = None, edges: Optional[list] = None):
+        self.name = name
+        self.offset = offset
+        self.categories = categories
+        self.edges = edges
+        if categories is not None:
+            self._index = {c: i for i, c in enumerate(categories)}
+            self.bins = len(categories) + 1  # last slot: values unseen in training
+        else:
+            self.bins = len(edges) + 1
+
+    def slot(self, value: Any) -> int:
+        if self.categories is not None:
+            return self.offset + self._index.get(value, self.bins - 1)
+        return self.offset + bisect.bisect_right(self.edges, float(value))
+
+    def labels(self) -> List[str]:
+        if self.categories is not None:
+            return [str(c) for c in self.categories] + ['<other>']
+        bounds = ['-inf'] + [f"{e:g}" for e in self.edges] + ['inf']
+        return [f"[{lo}, {hi})" for lo, hi in zip(bounds, bounds[1:])]
+
+
+class DriftMonitor:
+    """Sliding-window feature histograms compared against a training baseline."""
+
+    def __init__(self, baseline: Mapping[str, Iterable], categorical: Dict[str, list], numeric: List[str],
+                 bucket_seconds: float = BUCKET_SECONDS, window_buckets: int = WINDOW_BUCKETS,
+                 queue_size: int = 10_000, min_samples: int = MIN_SAMPLES):
+        """
+        :param baseline: Feature -> its training values (features may come from different datasets).
+        :param categorical: Categorical feature -> its training categories.
+        :param numeric: Numeric features, binned at the baseline's deciles.
+        :param bucket_seconds: Width of one time bucket of the sliding window.
+        :param window_buckets: Buckets in the window (window = bucket_seconds * window_buckets).
+        :param queue_size: Pending observations before new ones are dropped.
+        :param min_samples: Observations a feature needs in the window before it is scored.
+        """
+        self.features: Dict[str, _Feature] = {}
+        offset = 0
+        for name, categories in categorical.items():
+            self.features[name] = feature = _Feature(name, offset, categories=list(categories))
+            offset += feature.bins
+        for name in numeric:
+            edges = np.unique(np.quantile(np.asarray(baseline[name], dtype=float), np.linspace(0.1, 0.9, 9))).tolist()
+            self.features[name] = feature = _Feature(name, offset, edges=edges)
+            offset += feature.bins
+
+        self.baseline = np.zeros(offset)
+        for name, feature in self.features.items():
+            slots = np.array([feature.slot(v) for v in baseline[name]])
+            self.baseline += np.bincount(slots, minlength=offset)
+
+        self.min_samples = min_samples
+        self.bucket_seconds = bucket_seconds
+        self._buckets = np.zeros((window_buckets, offset), dtype=np.int64)
+        self._totals = np.zeros(offset, dtype=np.int64)
+        self._current = 0
+        self._bucket_start = time.monotonic()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        threading.Thread(target=self._worker, name='drift-monitor', daemon=True).start()
+
+    def observe(self, record: Dict[str, Any]):
+        """Queues one request's inputs; never blocks. Fields that aren't monitored are ignored."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _worker(self):
+        while True:
+            record = self._queue.get()
+            try:
+                self._count(record)
+            except Exception as e:
+                logger.error(f"Error recording drift observation: {e}")
+
+    def _count(self, record: Dict[str, Any]):
+        slots = [feature.slot(record[name]) for name, feature in self.features.items()
+                 if record.get(name) is not None]
+        with self._lock:
+            self._advance(time.monotonic())
+            self._buckets[self._current, slots] += 1
+            self._totals[slots] += 1
+
+    def _advance(self, now: float):
+        # Expire whole buckets that have slid out of the window
+        steps = int((now - self._bucket_start) // self.bucket_seconds)
+        if steps <= 0:
+            return
+        for _ in range(min(steps, len(self._buckets))):
+            self._current = (self._current + 1) % len(self._buckets)
+            self._totals -= self._buckets[self._current]
+            self._buckets[self._current] = 0
+        self._bucket_start += steps * self.bucket_seconds
+
+    def report(self) -> Dict[str, Any]:
+        """
+        PSI and chi-square per feature for the current window, worst first.
+        Features with fewer than `min_samples` observations are reported as
+        insufficient_data and never count as drifted.
+        """
+        with self._lock:
+            self._advance(time.monotonic())
+            window = self._totals.copy()
+
+        features = {}
+        for name, feature in self.features.items():
+            span = slice(feature.offset, feature.offset + feature.bins)
+            observed, reference = window[span].astype(float), self.baseline[span]
+            n = int(observed.sum())
+            features[name] = {'n': n, 'status': 'insufficient_data', 'psi': None, 'chi2': None, 'p_value': None,
+                              'window': dict(zip(feature.labels(), observed.astype(int).tolist()))}
+            if n < self.min_samples:
+                continue
+            p = np.maximum(observed / n, _EPS)
+            q = np.maximum(reference / reference.sum(), _EPS)
+            q /= q.sum()
+            statistic, dof = _chi_square(observed, q * n)
+            features[name].update({
+                'status': 'ok',
+                'psi': round(float(((p - q) * np.log(p / q)).sum()), 4),
+                'chi2': round(statistic, 2) if dof else None,
+                'p_value': float(chi2.sf(statistic, dof)) if dof else None,
+            })
+
+        ranked = sorted(features, key=lambda f: -(features[f]['psi'] or 0))
+        return {
+            'window_seconds': self.bucket_seconds * len(self._buckets),
+            'min_samples': self.min_samples,
+            'pending': self._queue.qsize(),
+            'dropped': self.dropped,
+            'drifted': [f for f in ranked if (features[f]['psi'] or 0) > PSI_ALERT],
+            'features': {f: features[f] for f in ranked},
+        }
+
+
+def _chi_square(observed: np.ndarray, expected: np.ndarray):
+    """
+    Pearson statistic and degrees of freedom, with bins expecting fewer than
+    MIN_EXPECTED observations pooled together (and, if the pool is still
+    too small, into the smallest remaining bin). dof 0 means no valid test.
+    """
+    sparse = expected < MIN_EXPECTED
+    if sparse.any():
+        pooled_observed, pooled_expected = observed[sparse].sum(), expected[sparse].sum()
+        observed, expected = observed[~sparse], expected[~sparse]
+        if pooled_expected >= MIN_EXPECTED or not len(expected):
+            observed, expected = np.append(observed, pooled_observed), np.append(expected, pooled_expected)
+        else:
+            smallest = int(np.argmin(expected))
+            observed, expected = observed.copy(), expected.copy()
+            observed[smallest] += pooled_observed
+            expected[smallest] += pooled_expected
+    if len(expected) < 2 or (expected < MIN_EXPECTED).any():
+        return 0.0, 0
+    return float(((observed - expected) ** 2 / expected).sum()), len(expected) - 1
+
+
+def load_monitor(prakriti_csv: str, stage2_csv: str, **kwargs) -> DriftMonitor:
+    """Baseline from the training CSVs: the questionnaire dataset and the Stage 2 patients."""
+    numeric = [name for name, _, _ in STAGE2_NUMERIC]
+    answers = pd.read_csv(prakriti_csv, usecols=list(PRAKRITI_CATEGORIES))
+    # keep_default_na=False: chronic_conditions uses the literal category 'None'
+    patients = pd.read_csv(stage2_csv, usecols=list(STAGE2_CATEGORIES) + numeric, keep_default_na=False)
+    baseline = {**{c: answers[c] for c in answers.columns}, **{c: patients[c] for c in patients.columns}}
+    return DriftMonitor(baseline, {**PRAKRITI_CATEGORIES, **STAGE2_CATEGORIES}, numeric, **kwargs)
+
+
+monitor = readiness.load('drift_baseline', lambda: load_monitor(
+    os.path.join(BACKEND_DIR, 'synthetic_data.csv'),
+    os.path.join(BACKEND_DIR, 'alzheimers_risk_dataset_stage2.csv')))
+
+
+def observe(record: Dict[str, Any]):
+    """Records one request's inputs for drift tracking (no-op if the baseline failed to load)."""
+    if monitor is not None:
+        monitor.observe(record)
@@ -0,0 +1,150 @@
+"""
+Per-answer explanations for the Prakriti random forest.
+
+Uses tree-path decomposition: walking a sample down a tree, every split
+moves the predicted class distribution from the parent node's value to the
+child's, and that change is credited to the answer the split tested.
+Averaged over the forest, the base value (mean root distribution) plus all
+answer contributions equals predict_proba exactly.
+
+Per-node deltas and the answer each split belongs to are precomputed once,
+so explaining is a level-by-level walk over all trees at the same time.
+"""
+from functools import lru_cache
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from app.core.codec import PRAKRITI_CATEGORIES, pack_prakriti_answers, unpack_prakriti_answers
+
+ANSWER_FIELDS = list(PRAKRITI_CATEGORIES)
+
+
+class ForestExplainer:
+    """Tree-path decomposition over a fitted sklearn forest trained on the one-hot Prakriti answers."""
+
+    def __init__(self, model, encoder, label_map: Dict[int, str], cache_size: int = 4096):
+        """
+        :param model: Fitted RandomForestClassifier (prakriti_model_robust.pkl).
+        :param encoder: The OneHotEncoder the model's input columns came from.
+        :param label_map: Class index -> dosha name, as used by the prediction endpoint.
+        """
+        self.doshas = [label_map[i] for i in range(len(model.classes_))]
+
+        # One-hot column -> (answer index, offset of that answer's first column)
+        column_answer, self._column_offset = [], []
+        for answer, categories in enumerate(encoder.categories_):
+            self._column_offset.append(len(column_answer))
+            column_answer.extend([answer] * len(categories))
+        column_answer = np.array(column_answer + [-1])  # -1: leaf, no split
+        self._n_columns = len(column_answer) - 1
+        self._categories = [{c: i for i, c in enumerate(cats)} for cats in encoder.categories_]
+        self._fields = list(getattr(encoder, 'feature_names_in_', ANSWER_FIELDS))
+
+        # Concatenate all trees into flat node arrays with global child indices
+        left, right, feature, threshold, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            roots.append(offset)
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(np.where(is_leaf, -1, tree.feature))
+            threshold.append(tree.threshold)
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+            offset += tree.node_count
+
+        self._left = np.concatenate(left)
+        self._right = np.concatenate(right)
+        self._feature = np.concatenate(feature)
+        self._threshold = np.concatenate(threshold)
+        self._answer = column_answer[self._feature]
+        self._roots = np.array(roots)
+        self._n_trees = len(roots)
+        probs = np.concatenate(values)
+
+        # delta[child] = value(child) - value(parent), credited to the parent's split answer
+        self._delta = np.zeros_like(probs)
+        internal = np.flatnonzero(self._feature >= 0)
+        for children in (self._left[internal], self._right[internal]):
+            self._delta[children] = probs[children] - probs[internal]
+        self.base = probs[self._roots].mean(axis=0)
+
+        self._explain_packed = lru_cache(maxsize=cache_size)(self._explain_packed)
+
+    def encode(self, answers_list) -> np.ndarray:
+        """One-hot encodes answer dicts like the fitted encoder (unknown answers -> all zeros)."""
+        X = np.zeros((len(answers_list), self._n_columns))
+        for row, answers in enumerate(answers_list):
+            for answer, field in enumerate(self._fields):
+                code = self._categories[answer].get(answers.get(field))
+                if code is not None:
+                    X[row, self._column_offset[answer] + code] = 1.0
+        return X
+
+    def contributions(self, X: np.ndarray) -> np.ndarray:
+        """
+        Batch decomposition of encoded rows: returns an array of shape
+        (n_samples, n_answers, n_classes); base + contributions.sum(axis=1)
+        is the forest's predict_proba.
+        """
+        n, n_answers = len(X), len(self._categories)
+        contrib = np.zeros((n * n_answers, len(self.doshas)))
+        sample = np.repeat(np.arange(n), self._n_trees)
+        node = np.tile(self._roots, n)
+        while len(node):
+            feature = self._feature[node]
+            split = feature >= 0
+            sample, node, feature = sample[split], node[split], feature[split]
+            go_left = X[sample, feature] <= self._threshold[node]
+            child = np.where(go_left, self._left[node], self._right[node])
+            slot = sample * n_answers + self._answer[node]
+            delta = self._delta[child]
+            for c in range(contrib.shape[1]):
+                contrib[:, c] += np.bincount(slot, weights=delta[:, c], minlength=len(contrib))
+            node = child
+        return contrib.reshape(n, n_answers, -1) / self._n_trees
+
+    def _explain_packed(self, packed: int):
+        contrib = self.contributions(self.encode([unpack_prakriti_answers(packed)]))[0]
+        contrib.setflags(write=False)
+        return contrib
+
+    def explain(self, answers: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Explains one questionnaire: base dosha percentages plus each answer's
+        contribution to each dosha, in percentage points. Cached per answer set.
+        """
+        packed = pack_prakriti_answers(answers)
+        if packed is not None and len(answers) == len(ANSWER_FIELDS):
+            contrib = self._explain_packed(packed)
+        else:
+            contrib = self.contributions(self.encode([answers]))[0]
+        return {
+            "Base_Score": {d: round(float(b) * 100, 2) for d, b in zip(self.doshas, self.base)},
+            "Contributions": {
+                field: {d: round(float(c) * 100, 2) for d, c in zip(self.doshas, row)}
+                for field, row in zip(self._fields, contrib)
+            },
+        }
+
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorized encode() for a DataFrame of answers."""
+        X = np.zeros((len(df), self._n_columns))
+        rows = np.arange(len(df))
+        for answer, field in enumerate(self._fields):
+            codes = pd.Categorical(df[field], categories=list(self._categories[answer])).codes
+            known = codes >= 0
+            X[rows[known], self._column_offset[answer] + codes[known]] = 1.0
+        return X
+
+    def explain_batch(self, answers) -> np.ndarray:
+        """
+        Uncached batch variant for the offline pipeline: takes a DataFrame
+        (or list of dicts) of answers, returns contributions() output.
+        """
+        X = self.encode_frame(answers) if isinstance(answers, pd.DataFrame) else self.encode(answers)
+        return self.contributions(X)
@@ -0,0 +1,325 @@
+"""
+In-memory spatial and text-prefix index over hospitals and specialists.
+
+Facilities are bucketed into a fixed lat/lng grid (sorted by cell so each
+cell is one contiguous slice of the coordinate arrays). Nearest-N queries
+walk rings of cells outwards from the query point and stop as soon as the
+N-th best distance is closer than anything an unvisited ring could hold
+(far out, only occupied cells are visited); radius queries only touch the cells overlapping the circle's bounding box.
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+FACILITY_COLUMNS = ['id', 'kind', 'name', 'address', 'phone', 'lat', 'lng', 'rating',
+                    'specialties', 'emergency', 'hours']
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Great-circle distance from one point to arrays of points, in km."""
+    lat, lng = math.radians(lat), math.radians(lng)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    a = np.sin((lats - lat) / 2) ** 2 + math.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class FacilityIndex:
+    """Grid + prefix index over a facilities table (one row per hospital or specialist)."""
+
+    def __init__(self, facilities: pd.DataFrame, cell_deg: float = 0.02, scan_below: int = 2048):
+        """
+        :param facilities: DataFrame with FACILITY_COLUMNS; specialties are ';'-separated.
+        :param cell_deg: Grid cell size in degrees (0.02 is about 2.2 km).
+        :param scan_below: Datasets smaller than this are brute-force scanned.
+        """
+        self.cell_deg = cell_deg
+        self.scan_below = scan_below
+        self.n_rows = int(math.ceil(180 / cell_deg))
+        self.n_cols = int(math.ceil(360 / cell_deg))
+
+        facilities = facilities.reset_index(drop=True)
+        lat = facilities['lat'].to_numpy(dtype=np.float64)
+        lng = facilities['lng'].to_numpy(dtype=np.float64)
+        keys = self._cell_rows(lat) * self.n_cols + self._cell_cols(lng)
+        order = np.argsort(keys, kind='stable')
+
+        # Everything below is stored in cell order
+        self._lat = lat[order]
+        self._lng = lng[order]
+        self._rows = {
+            col: facilities[col].to_numpy(dtype=object)[order]
+            for col in FACILITY_COLUMNS if col in facilities
+        }
+        raw_specialties = self._rows['specialties']
+        split_cache = {raw: self._split(raw) for raw in set(raw_specialties.tolist())}
+        specialties = [split_cache[raw] for raw in raw_specialties]
+        self._rows['specialties'] = np.array(specialties + [None], dtype=object)[:-1]
+
+        sorted_keys = keys[order]
+        cells, starts = np.unique(sorted_keys, return_index=True)
+        ends = np.append(starts[1:], len(sorted_keys))
+        self._cells = dict(zip(cells.tolist(), zip(starts.tolist(), ends.tolist())))
+        # Occupied cells as arrays, for expanding past the ring limit without visiting empty cells
+        self._cell_row, self._cell_col = cells // self.n_cols, cells % self.n_cols
+        self._cell_start, self._cell_end = starts, ends
+
+        self._kinds = sorted({str(k).lower() for k in self._rows['kind']})
+        kind_code = {k: i for i, k in enumerate(self._kinds)}
+        self._kind = np.array([kind_code[str(k).lower()] for k in self._rows['kind']], dtype=np.int16)
+
+        # Specialty filter: one bit per distinct specialty, packed into uint64 words
+        self._specialties = sorted({s.lower() for names in split_cache.values() for s in names})
+        bit = {s: i for i, s in enumerate(self._specialties)}
+        words = max(1, (len(self._specialties) + 63) // 64)
+        raw_masks = {}
+        for raw, names in split_cache.items():
+            value = sum(1 << b for b in {bit[name.lower()] for name in names})
+            raw_masks[raw] = [(value >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(words)]
+        self._masks = np.array([raw_masks[raw] for raw in raw_specialties], dtype=np.uint64).reshape(-1, words)
+
+        # Prefix index: every word of the name and every specialty, lower-cased.
+        # Postings are grouped by token, each token's owners sorted by name.
+        names = [str(name).lower().strip() for name in self._rows['name']]
+        self._name_rank = np.empty(len(names), dtype=np.int64)
+        self._name_rank[np.argsort(np.array(names, dtype=object), kind='stable')] = np.arange(len(names))
+        specialty_tokens = {raw: {s.lower() for s in names_} for raw, names_ in split_cache.items()}
+        tokens, owners = [], []
+        for i, (name, raw) in enumerate(zip(names, raw_specialties)):
+            row_tokens = set(name.split()) | specialty_tokens[raw]
+            tokens.extend(row_tokens)
+            owners.extend([i] * len(row_tokens))
+        tokens = np.array(tokens, dtype=str)
+        owners = np.array(owners, dtype=np.int64)
+        token_order = np.lexsort((self._name_rank[owners], tokens))
+        tokens, self._token_owner = tokens[token_order], owners[token_order]
+        firsts = np.flatnonzero(np.r_[True, tokens[1:] != tokens[:-1]]) if len(tokens) else np.empty(0, np.int64)
+        self._tokens = tokens[firsts]  # distinct tokens, sorted
+        self._token_starts = np.append(firsts, len(tokens))  # postings of token t: starts[t]:starts[t + 1]
+
+    def __len__(self) -> int:
+        return len(self._lat)
+
+    @staticmethod
+    def _split(specialties) -> List[str]:
+        if not isinstance(specialties, str):
+            return []
+        return [s.strip() for s in specialties.split(';') if s.strip()]
+
+    def _cell_rows(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cell_cols(self, lng):
+        return (np.floor((np.asarray(lng) + 180) / self.cell_deg).astype(np.int64)) % self.n_cols
+
+    @property
+    def specialties(self) -> List[str]:
+        return list(self._specialties)
+
+    def _filter_mask(self, specialty: Optional[str]):
+        """Bit mask of every known specialty containing the search text, as the frontend matches."""
+        if not specialty:
+            return None
+        needle = specialty.lower()
+        mask = np.zeros(self._masks.shape[1], dtype=np.uint64)
+        for b, name in enumerate(self._specialties):
+            if needle in name:
+                mask[b // 64] |= np.uint64(1) << np.uint64(b % 64)
+        return mask
+
+    def _keep(self, idx, spec_mask, kind):
+        if spec_mask is not None:
+            idx = idx[(self._masks[idx] & spec_mask).any(axis=1)]
+        if kind is not None:
+            code = self._kinds.index(kind.lower()) if kind.lower() in self._kinds else -1
+            idx = idx[self._kind[idx] == code]
+        return idx
+
+    def _gather(self, cells):
+        spans = [self._cells[c] for c in cells if c in self._cells]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(s, e) for s, e in spans])
+
+    def _ring(self, row, col, k):
+        """Cell keys on the square ring at Chebyshev distance k around (row, col)."""
+        if k == 0:
+            return [row * self.n_cols + col]
+        cells = []
+        for r in range(row - k, row + k + 1):
+            if not 0 <= r < self.n_rows:
+                continue
+            step = 1 if r in (row - k, row + k) else 2 * k
+            for c in range(col - k, col + k + 1, step):
+                cells.append(r * self.n_cols + c % self.n_cols)
+        return cells
+
+    def _result(self, idx, dist) -> List[Dict[str, Any]]:
+        results = []
+        for i, d in zip(idx.tolist(), [None] * len(idx) if dist is None else dist.tolist()):
+            row = {col: values[i] for col, values in self._rows.items()}
+            row['specialties'] = list(row['specialties'])
+            row['lat'], row['lng'] = float(self._lat[i]), float(self._lng[i])
+            row['distance_km'] = None if d is None else round(d, 3)
+            results.append(row)
+        return results
+
+    def _scan(self, lat, lng, spec_mask, kind, radius_km=None):
+        idx = self._keep(np.arange(len(self)), spec_mask, kind)
+        dist = haversine_km(lat, lng, self._lat[idx], self._lng[idx])
+        if radius_km is not None:
+            inside = dist <= radius_km
+            idx, dist = idx[inside], dist[inside]
+        return idx, dist
+
+    @staticmethod
+    def _top(idx, dist, limit):
+        if len(idx) > limit:
+            part = np.argpartition(dist, limit - 1)[:limit]
+            idx, dist = idx[part], dist[part]
+        order = np.argsort(dist, kind='stable')
+        return idx[order], dist[order]
+
+    def _reach_km(self, lat, k):
+        """Lower bound on the distance from a point to anything outside its ring k."""
+        # Anything outside ring k is at least k cells away along one axis
+        edge_lat = min(90.0, abs(lat) + (k + 1) * self.cell_deg)
+        return k * self.cell_deg * KM_PER_DEG * min(1.0, math.cos(math.radians(edge_lat)))
+
+    def _expand(self, lat, lng, limit, keep, max_rings):
+        """
+        The `limit` closest facilities passing keep(idx), visiting rings of
+        cells outwards until nothing further out can be closer. Past
+        max_rings only occupied cells are visited, nearest ring first.
+        """
+        row, col = int(self._cell_rows(lat)), int(self._cell_cols(lng))
+        found_idx, found_dist = [], []
+        total = 0
+
+        def settled(idx, k):
+            nonlocal total
+            idx = keep(idx)
+            if len(idx):
+                found_idx.append(idx)
+                found_dist.append(haversine_km(lat, lng, self._lat[idx], self._lng[idx]))
+                total += len(idx)
+            return total >= limit and np.partition(np.concatenate(found_dist), limit - 1)[limit - 1] <= self._reach_km(lat, k)
+
+        def found():
+            if not found_idx:
+                return np.empty(0, dtype=np.int64), np.empty(0)
+            return self._top(np.concatenate(found_idx), np.concatenate(found_dist), limit)
+
+        for k in range(max_rings + 1):
+            if settled(self._gather(self._ring(row, col, k)), k):
+                return found()
+
+        # Sparse neighbourhood (or a rare filter): carry on over the occupied cells only
+        col_gap = np.abs(self._cell_col - col)
+        rings = np.maximum(np.abs(self._cell_row - row), np.minimum(col_gap, self.n_cols - col_gap))
+        far = np.flatnonzero(rings > max_rings)
+        far = far[np.argsort(rings[far], kind='stable')]
+        for group in np.split(far, np.flatnonzero(np.diff(rings[far])) + 1):
+            if not len(group):
+                continue
+            idx = np.concatenate([np.arange(s, e) for s, e in zip(self._cell_start[group].tolist(),
+                                                                   self._cell_end[group].tolist())])
+            if settled(idx, int(rings[group[0]])):
+                break
+        return found()
+
+    def nearest(self, lat: float, lng: float, limit: int = 10, specialty: Optional[str] = None,
+                kind: Optional[str] = None, max_rings: int = 32) -> List[Dict[str, Any]]:
+        """Returns the `limit` closest facilities, optionally filtered by specialty text and kind."""
+        spec_mask = self._filter_mask(specialty)
+        if (spec_mask is not None and not spec_mask.any()) or (kind is not None and kind.lower() not in self._kinds):
+            return []
+        if len(self) < self.scan_below:
+            return self._result(*self._top(*self._scan(lat, lng, spec_mask, kind), limit))
+        return self._result(*self._expand(lat, lng, limit, lambda idx: self._keep(idx, spec_mask, kind), max_rings))
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: int = 50,
+               specialty: Optional[str] = None, kind: Optional[str] = None,
+               max_cells: int = 4096) -> List[Dict[str, Any]]:
+        """Returns facilities within radius_km, closest first."""
+        spec_mask = self._filter_mask(specialty)
+        dlat = radius_km / KM_PER_DEG
+        edge_lat = min(89.9, abs(lat) + dlat)
+        dlng = min(180.0, radius_km / (KM_PER_DEG * math.cos(math.radians(edge_lat))))
+        rows = range(int(self._cell_rows(lat - dlat)), int(self._cell_rows(lat + dlat)) + 1)
+        col_lo = int(np.floor((lng - dlng + 180) / self.cell_deg))
+        col_hi = int(np.floor((lng + dlng + 180) / self.cell_deg))
+
+        if len(self) < self.scan_below or len(rows) * (col_hi - col_lo + 1) > max_cells:
+            idx, dist = self._scan(lat, lng, spec_mask, kind, radius_km)
+        else:
+            cells = [r * self.n_cols + c % self.n_cols for r in rows for c in range(col_lo, col_hi + 1)]
+            idx = self._keep(self._gather(cells), spec_mask, kind)
+            dist = haversine_km(lat, lng, self._lat[idx], self._lng[idx])
+            inside = dist <= radius_km
+            idx, dist = idx[inside], dist[inside]
+        return self._result(*self._top(idx, dist, limit))
+
+    def search(self, prefix: str, limit: int = 10, lat: Optional[float] = None, lng: Optional[float] = None,
+               max_rings: int = 32) -> List[Dict[str, Any]]:
+        """
+        Facilities with a name word or specialty starting with prefix (a
+        multi-word prefix must match consecutive words). Closest first when a
+        location is given, otherwise by name.
+        """
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+        first = prefix.split(' ', 1)[0]
+        lo = int(np.searchsorted(self._tokens, first, side='left'))
+        hi = int(np.searchsorted(self._tokens, first + '\U0010ffff', side='left'))
+        owners = self._token_owner[self._token_starts[lo]:self._token_starts[hi]]
+        multi_word = ' ' in prefix
+
+        def matching(idx):
+            if not multi_word:
+                return idx
+            return np.array([i for i in idx.tolist() if self._matches_words(i, prefix)], dtype=np.int64)
+
+        if lat is not None and lng is not None:
+            if len(self) < self.scan_below or len(owners) < self.scan_below:
+                idx = matching(np.unique(owners))
+                return self._result(*self._top(idx, haversine_km(lat, lng, self._lat[idx], self._lng[idx]), limit))
+            # Common prefix: walk the grid outwards, keeping the matching facilities
+            owned = np.zeros(len(self), dtype=bool)
+            owned[owners] = True
+            return self._result(*self._expand(lat, lng, limit, lambda idx: matching(idx[owned[idx]]), max_rings))
+
+        if multi_word:
+            idx = np.unique(owners)
+            hits = []
+            for i in idx[np.argsort(self._name_rank[idx], kind='stable')].tolist():
+                if self._matches_words(i, prefix):
+                    hits.append(i)
+                    if len(hits) == limit:
+                        break
+            return self._result(np.array(hits, dtype=np.int64), None)
+
+        # Each token's owners are sorted by name, so the overall first `limit`
+        # are among the first `limit` owners of every matching token
+        starts = self._token_starts[lo:hi]
+        take = np.minimum(self._token_starts[lo + 1:hi + 1] - starts, limit)
+        positions = np.repeat(starts - (np.cumsum(take) - take), take) + np.arange(take.sum())
+        idx = self._token_owner[positions]
+        ranked = idx[np.argsort(self._name_rank[idx], kind='stable')]
+        return self._result(np.array(list(dict.fromkeys(ranked.tolist()))[:limit], dtype=np.int64), None)
+
+    def _matches_words(self, i, prefix):
+        texts = [str(self._rows['name'][i]).lower()] + [s.lower() for s in self._rows['specialties'][i]]
+        return any((' ' + ' '.join(text.split())).find(' ' + prefix) >= 0 for text in texts)
+
+
+def load_facilities(path: str, **kwargs) -> FacilityIndex:
+    """Builds a FacilityIndex from a facilities CSV (see data/facilities.csv for the layout)."""
+    facilities = pd.read_csv(path, dtype={'id': str, 'phone': str}, keep_default_na=False)
+    facilities['emergency'] = facilities['emergency'].astype(str).str.lower().isin(['true', 'yes', '1'])
+    return FacilityIndex(facilities, **kwargs)
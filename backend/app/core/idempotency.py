@@ -0,0 +1,126 @@
+"""
+Idempotency-Key handling for endpoints that clients retry.
+
+A retried request carrying the same key is answered from the stored
+response instead of rerunning the analysis (and inserting another
+assessment). The first request claims the key by inserting a pending row
+(the table's primary key makes the claim atomic across worker processes);
+concurrent duplicates wait for that row to be completed instead of
+recomputing it.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# A claim whose owner died is taken over after this long
+DEFAULT_LEASE_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.05
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Stable hash of a request body, used to reject keys reused for a different request."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _InFlight:
+    """The first execution for a key; duplicates wait on `done`."""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class IdempotencyRegistry:
+    """
+    Runs a computation at most once per (scope, Idempotency-Key).
+
+    Keys are claimed in the database's idempotency_keys table and completed
+    responses are kept there for `ttl_seconds`. Duplicates in the same
+    process wait on the in-memory entry; duplicates in other processes poll
+    the pending row. Failed executions release their claim, so the client
+    can retry them.
+    """
+
+    def __init__(self, db, ttl_seconds: int = DEFAULT_TTL_SECONDS, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        :param db: app.database.DatabaseManager holding the idempotency_keys table.
+        :param ttl_seconds: How long a completed response is replayed.
+        :param lease_seconds: How long a pending claim blocks other requests for the key.
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._in_flight: Dict[tuple, _InFlight] = {}
+
+    def run(self, key: Optional[str], scope: str, payload: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Returns compute()'s result, or the stored/in-flight result for a
+        repeated key. Raises 422 if the key was used with a different payload.
+        """
+        if not key:
+            return compute()
+
+        fingerprint = request_fingerprint(payload)
+        stored = self.db.get_idempotent_response(key, scope)
+        if stored is not None and not stored['pending']:
+            return self._check(stored['request_hash'], fingerprint, stored['response'])
+
+        with self._lock:
+            entry = self._in_flight.get((scope, key))
+            owner = entry is None
+            if owner:
+                entry = self._in_flight[(scope, key)] = _InFlight(fingerprint)
+
+        if not owner:
+            entry.done.wait()
+            if entry.error is not None:
+                raise entry.error
+            return self._check(entry.fingerprint, fingerprint, entry.result)
+
+        try:
+            entry.fingerprint, entry.result = self._run_once(key, scope, fingerprint, compute)
+        except BaseException as e:
+            entry.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[(scope, key)]
+            entry.done.set()
+        return self._check(entry.fingerprint, fingerprint, entry.result)
+
+    def _run_once(self, key: str, scope: str, fingerprint: str, compute: Callable[[], Any]) -> Tuple[str, Any]:
+        """Claims the key and computes, or waits for the claim holder; returns (fingerprint, response)."""
+        while True:
+            stored = self.db.get_idempotent_response(key, scope)
+            if stored is None:
+                claimed = self.db.claim_idempotency_key(key, scope, fingerprint, self.lease_seconds)
+                if claimed is None:
+                    # Database unavailable: behave as if no key was sent
+                    return fingerprint, compute()
+                if not claimed:
+                    continue  # another process claimed it first; read its row
+                try:
+                    result = compute()
+                except BaseException:
+                    self.db.release_idempotency_key(key, scope)
+                    raise
+                self.db.save_idempotent_response(key, scope, fingerprint, result, self.ttl_seconds)
+                return fingerprint, result
+            if not stored['pending'] or stored['request_hash'] != fingerprint:
+                return stored['request_hash'], stored['response']
+            # Claimed by another process; its lease expiring turns this into a fresh claim
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+    @staticmethod
+    def _check(stored_fingerprint: str, fingerprint: str, result: Any) -> Any:
+        if stored_fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request body")
+        return result
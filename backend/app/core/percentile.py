@@ -0,0 +1,151 @@
+"""
+Percentile of a Stage 2 risk score within the reference cohort
+(alzheimers_risk_dataset_stage2.csv): overall, by prakriti_type, age band
+and gender, and within the patient's exact (prakriti_type, age band,
+gender) cohort.
+
+Each group keeps its scores in a sorted numpy array, so a lookup is two
+binary searches. New scores go into a small sorted buffer and are merged
+into the array in one pass (np.insert at searchsorted positions) once the
+buffer fills up, so the cohort is never re-sorted. Recorded scores form a
+sliding window on top of the reference cohort: past `max_recorded` the
+oldest is dropped again (buffered the same way), so memory stays bounded.
+"""
+import bisect
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+AGE_BAND_EDGES = [40, 50, 60, 70, 80]
+AGE_BANDS = ['<40', '40-49', '50-59', '60-69', '70-79', '80+']
+# Most recent recorded scores kept in the index, on top of the reference cohort
+MAX_RECORDED = int(os.environ.get('PERCENTILE_MAX_RECORDED') or 50_000)
+
+
+def age_band(age: float) -> str:
+    return AGE_BANDS[bisect.bisect_right(AGE_BAND_EDGES, age)]
+
+
+class SortedScores:
+    """Sorted score array plus sorted buffers of recent additions and removals."""
+
+    def __init__(self, scores: Iterable[float] = ()):
+        self.base = np.sort(np.asarray(list(scores), dtype=float))
+        self.pending: list = []
+        self.removed: list = []  # scores still in `base` that no longer count
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.pending) - len(self.removed)
+
+    def rank(self, score: float) -> Tuple[int, int]:
+        """(number of scores below `score`, number equal to it)."""
+        below = int(np.searchsorted(self.base, score, 'left'))
+        upto = int(np.searchsorted(self.base, score, 'right'))
+        below += bisect.bisect_left(self.pending, score) - bisect.bisect_left(self.removed, score)
+        upto += bisect.bisect_right(self.pending, score) - bisect.bisect_right(self.removed, score)
+        return below, upto - below
+
+    def add(self, score: float, merge_at: int):
+        bisect.insort(self.pending, float(score))
+        if len(self.pending) + len(self.removed) >= merge_at:
+            self.merge()
+
+    def remove(self, score: float, merge_at: int):
+        """Drops one occurrence of a score previously added."""
+        score = float(score)
+        i = bisect.bisect_left(self.pending, score)
+        if i < len(self.pending) and self.pending[i] == score:
+            del self.pending[i]
+            return
+        bisect.insort(self.removed, score)
+        if len(self.pending) + len(self.removed) >= merge_at:
+            self.merge()
+
+    def merge(self):
+        """Folds both buffers into the sorted array in O(n + m), without sorting."""
+        if self.removed:
+            gone = np.asarray(self.removed)
+            # Repeated scores remove consecutive occurrences
+            nth = np.arange(len(gone)) - np.searchsorted(gone, gone, 'left')
+            self.base = np.delete(self.base, np.searchsorted(self.base, gone, 'left') + nth)
+            self.removed = []
+        if self.pending:
+            new = np.asarray(self.pending)
+            self.base = np.insert(self.base, np.searchsorted(self.base, new), new)
+            self.pending = []
+
+
+class PercentileIndex:
+    """Per-group sorted score arrays for mid-rank percentile lookups."""
+
+    def __init__(self, cohort: pd.DataFrame, score_column: str = 'risk_score', merge_at: int = 256,
+                 max_recorded: int = MAX_RECORDED):
+        """
+        :param cohort: Reference patients with prakriti_type, age, gender and a score column.
+        :param merge_at: Buffered additions per group before they are merged into its array.
+        :param max_recorded: Recorded scores kept; older ones are dropped as new ones arrive.
+        """
+        self.merge_at = merge_at
+        self.max_recorded = max_recorded
+        self._recorded: deque = deque()  # (group keys, score), oldest first
+        self._lock = threading.Lock()
+        cohort = cohort.assign(age_band=[age_band(age) for age in cohort['age']])
+        scores = cohort[score_column].astype(float)
+        self._groups: Dict[tuple, SortedScores] = {('overall',): SortedScores(scores)}
+        for column in ('prakriti_type', 'age_band', 'gender'):
+            for value, group in scores.groupby(cohort[column]):
+                self._groups[(column, value)] = SortedScores(group)
+        for key, group in scores.groupby([cohort['prakriti_type'], cohort['age_band'], cohort['gender']]):
+            self._groups[('cohort', *key)] = SortedScores(group)
+
+    @staticmethod
+    def _keys(patient: Dict[str, Any]) -> Dict[str, tuple]:
+        band = age_band(patient['age'])
+        return {
+            'overall': ('overall',),
+            'prakriti_type': ('prakriti_type', patient['prakriti_type']),
+            'age_band': ('age_band', band),
+            'gender': ('gender', patient['gender']),
+            'cohort': ('cohort', patient['prakriti_type'], band, patient['gender']),
+        }
+
+    def percentiles(self, patient: Dict[str, Any], score: float) -> Dict[str, Optional[float]]:
+        """
+        Percent of each reference group scoring below `score` (ties count
+        half). None for a group with no reference patients.
+        """
+        result = {}
+        with self._lock:
+            for name, key in self._keys(patient).items():
+                group = self._groups.get(key)
+                if not group:
+                    result[name] = None
+                    continue
+                below, equal = group.rank(score)
+                result[name] = round(100 * (below + 0.5 * equal) / len(group), 1)
+        return result
+
+    def add(self, patient: Dict[str, Any], score: float):
+        """Adds one scored patient to every group it belongs to, dropping the oldest recorded one past the cap."""
+        keys = tuple(self._keys(patient).values())
+        with self._lock:
+            for key in keys:
+                self._groups.setdefault(key, SortedScores()).add(score, self.merge_at)
+            self._recorded.append((keys, score))
+            if len(self._recorded) > self.max_recorded:
+                old_keys, old_score = self._recorded.popleft()
+                for key in old_keys:
+                    self._groups[key].remove(old_score, self.merge_at)
+
+    def __len__(self) -> int:
+        return len(self._groups[('overall',)])
+
+
+def load_reference(path: str, **kwargs) -> PercentileIndex:
+    """Builds a PercentileIndex from the Stage 2 dataset CSV."""
+    cohort = pd.read_csv(path, usecols=['prakriti_type', 'age', 'gender', 'risk_score'])
+    return PercentileIndex(cohort, **kwargs)
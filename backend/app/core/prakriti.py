@@ -0,0 +1,144 @@
+"""
+Stage 1: Prakriti (dosha) classification from the questionnaire.
+
+The model and encoder are loaded once here and shared by every endpoint
+that needs a Prakriti prediction; load state and warm-up timings are
+reported through app.core.readiness.
+"""
+import os
+from typing import Any, Dict
+
+import joblib
+import pandas as pd
+
+from app.core.codec import check_encoder_order
+from app.core.explain import ForestExplainer
+from app.core.readiness import readiness
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+MODEL_DIR = os.path.join(BACKEND_DIR, 'model')
+
+
+def _load_encoder():
+    encoder = joblib.load(os.path.join(MODEL_DIR, 'prakriti_encoder.pkl'))
+    check_encoder_order(encoder)  # stored answers are packed in the encoder's category order
+    return encoder
+
+
+# Load model and encoder; a mismatched encoder is reported by /readyz like a failed load
+model = readiness.load('prakriti_model', lambda: joblib.load(os.path.join(MODEL_DIR, 'prakriti_model_robust.pkl')))
+encoder = readiness.load('prakriti_encoder', _load_encoder)
+
+# Label mapping from your prototype
+label_map = {0: 'Kapha', 1: 'Pitta', 2: 'Vata'}
+
+# Per-answer explanations (tree-path decomposition), precomputed from the forest
+explainer = None
+if model is not None and encoder is not None:
+    explainer = readiness.load('prakriti_explainer', lambda: ForestExplainer(model, encoder, label_map))
+
+
+class ExplanationUnavailable(RuntimeError):
+    """Raised for explain=True when the explainer failed to load (see /readyz)."""
+
+
+# Recommendation bank from your prototype
+recommendation_bank = {
+    "Vata": {
+        "Diet": "Eat warm, moist, and grounding foods like soups, cooked grains, and ghee.",
+        "Yoga": "Slow, grounding yoga like Hatha or Yin. Avoid overstimulation.",
+        "Sleep": "Stick to a fixed schedule, warm oil massage before bed.",
+        "Stress": "Meditation, calming music, warm baths, and journaling."
+    },
+    "Pitta": {
+        "Diet": "Eat cooling foods like cucumbers, coconut, dairy. Avoid spicy/oily items.",
+        "Yoga": "Calming yoga like Moon Salutation and restorative poses.",
+        "Sleep": "Sleep in a cool, dark room. Avoid late-night stimulation.",
+        "Stress": "Practice pranayama (Sheetali), nature walks, and reduce competition."
+    },
+    "Kapha": {
+        "Diet": "Favor light, dry, and spicy foods. Avoid heavy, oily meals.",
+        "Yoga": "Dynamic, energizing yoga like Vinyasa or Power Yoga.",
+        "Sleep": "Wake early. Avoid excessive napping or oversleeping.",
+        "Stress": "Stimulate with new routines, breathwork, and active hobbies."
+    }
+}
+
+
+def predict_prakriti(answers: Dict[str, Any], explain: bool = False, legacy_format: bool = False) -> Dict[str, Any]:
+    """
+    Classifies one questionnaire. Returns Prakriti_Score (percent per dosha),
+    Verdict and Recommendations, plus an Explanation when `explain` is set.
+    `legacy_format` keeps the verdict/recommendation wording of the former
+    standalone app (backend/main.py) for its /predict_prakriti clients.
+    """
+    if model is None or encoder is None:
+        raise RuntimeError("Prakriti model is not loaded")
+    if explain and explainer is None:
+        raise ExplanationUnavailable("Explanations unavailable")
+    user_encoded = encoder.transform(pd.DataFrame([answers]))
+    user_encoded_df = pd.DataFrame(user_encoded, columns=encoder.get_feature_names_out())
+
+    # Prediction
+    probs = model.predict_proba(user_encoded_df)[0]
+    prakriti_score = {label_map[i]: int(prob * 100) for i, prob in enumerate(probs)}
+
+    # Dosha logic to determine verdict and recommendations
+    sorted_doshas = sorted(prakriti_score.items(), key=lambda x: x[1], reverse=True)
+    top1, top2 = sorted_doshas[0], sorted_doshas[1]
+    diff = top1[1] - top2[1]
+
+    if legacy_format:
+        verdict, recommendations = _legacy_verdict(top1, top2, diff)
+    elif top1[1] >= 60 and diff >= 20:
+        verdict = f"Dominant Prakriti: {top1[0]}"
+        recommendations = recommendation_bank[top1[0]]
+    else:
+        verdict = f"Mix Prakriti: {top1[0]} - {top2[0]}"
+        # Combine recommendations for mixed types
+        recommendations = {
+            "Diet": f"Primary: {recommendation_bank[top1[0]]['Diet']} Secondary: {recommendation_bank[top2[0]]['Diet']}",
+            "Yoga": f"Primary: {recommendation_bank[top1[0]]['Yoga']} Secondary: {recommendation_bank[top2[0]]['Yoga']}",
+            "Sleep": f"Primary: {recommendation_bank[top1[0]]['Sleep']} Secondary: {recommendation_bank[top2[0]]['Sleep']}",
+            "Stress": f"Primary: {recommendation_bank[top1[0]]['Stress']} Secondary: {recommendation_bank[top2[0]]['Stress']}"
+        }
+
+    response = {
+        "Prakriti_Score": prakriti_score,
+        "Verdict": verdict,
+        "Recommendations": recommendations
+    }
+    if explain:
+        # Base_Score + the sum of an answer column's contributions = the dosha probability (in %)
+        response["Explanation"] = explainer.explain(answers)
+    return response
+
+
+def _legacy_verdict(top1, top2, diff):
+    """Verdict and recommendations worded as backend/main.py returned them."""
+    if top1[1] >= 60 and diff >= 20:
+        return f"🧬 Dominant Prakriti: {top1[0]}", recommendation_bank[top1[0]]
+    first, second = recommendation_bank[top1[0]], recommendation_bank[top2[0]]
+    return f"⚖️ Mix Prakriti: {top1[0]} - {top2[0]}", {
+        "Diet": f"{first['Diet']} Also consider: {second['Diet']}",
+        "Yoga": f"{first['Yoga']} Also try: {second['Yoga']}",
+        "Sleep": f"{first['Sleep']} + {second['Sleep']}",
+        "Stress": f"{first['Stress']} / {second['Stress']}"
+    }
+
+
+def dominant_dosha(prakriti_score: Dict[str, int]) -> str:
+    """The highest-scoring dosha, i.e. the prakriti_type Stage 2 expects."""
+    return max(prakriti_score, key=prakriti_score.get)
+
+
+def _warm_up(rows: int = 64):
+    """Representative predictions from synthetic_data.csv: fills sklearn/pandas lazy paths and the explain cache."""
+    answers = pd.read_csv(os.path.join(BACKEND_DIR, 'synthetic_data.csv'), nrows=rows).drop(columns=['Dosha'])
+    for i, row in enumerate(answers.to_dict('records')):
+        predict_prakriti(row, explain=i % 4 == 0)
+    if explainer is not None:
+        explainer.explain_batch(answers)
+
+
+readiness.add_warmup('prakriti_model', _warm_up)
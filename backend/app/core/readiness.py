@@ -0,0 +1,98 @@
+"""
+Model load/warm-up bookkeeping behind the /healthz and /readyz probes.
+
+Modules load their models through `readiness.load()`, which times the load
+and records failures instead of crashing or silently leaving None behind,
+and register a warm-up step that runs representative predictions. The app
+runs all warm-up steps in a background thread at startup; /readyz only
+reports ready once every model loaded, warm-up finished and the database
+answers.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Per-model load and warm-up state for one worker process."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self._warmups: List[Tuple[str, Callable[[], Any]]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.warmup_started = False
+        self.warmup_done = False
+        self.warmup_ms: Optional[float] = None
+
+    def _state(self, name: str) -> Dict[str, Any]:
+        return self.models.setdefault(name, {'loaded': False, 'load_ms': None, 'warmed': False,
+                                             'warmup_ms': None, 'error': None})
+
+    def load(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Runs loader(), recording its duration; returns None (and records the error) if it fails."""
+        state = self._state(name)
+        start = time.perf_counter()
+        try:
+            obj = loader()
+        except Exception as e:
+            state['error'] = f"load failed: {e}"
+            logger.error(f"Error loading {name}: {e}")
+            return None
+        state['load_ms'] = round((time.perf_counter() - start) * 1e3, 1)
+        state['loaded'] = True
+        logger.info(f"Loaded {name} in {state['load_ms']} ms")
+        return obj
+
+    def add_warmup(self, name: str, step: Callable[[], Any]):
+        """Registers a warm-up step for a loaded model; it runs once during warm_up()."""
+        self._warmups.append((name, step))
+
+    def warm_up(self):
+        """Runs every registered warm-up step, recording per-model timings."""
+        start = time.perf_counter()
+        for name, step in self._warmups:
+            state = self._state(name)
+            if not state['loaded']:
+                continue
+            step_start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                state['error'] = f"warm-up failed: {e}"
+                logger.error(f"Error warming up {name}: {e}")
+                continue
+            state['warmup_ms'] = round((time.perf_counter() - step_start) * 1e3, 1)
+            state['warmed'] = True
+            logger.info(f"Warmed up {name} in {state['warmup_ms']} ms")
+        self.warmup_ms = round((time.perf_counter() - start) * 1e3, 1)
+        self.warmup_done = True
+
+    def start_warm_up(self) -> threading.Thread:
+        """Starts warm_up() in a background thread (once) so liveness probes answer meanwhile."""
+        with self._lock:
+            if self._thread is None:
+                self.warmup_started = True
+                self._thread = threading.Thread(target=self.warm_up, name='model-warmup', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def models_ready(self) -> bool:
+        return all(state['loaded'] and state['error'] is None for state in self.models.values())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'models': self.models,
+            'warmup': {'started': self.warmup_started, 'done': self.warmup_done, 'total_ms': self.warmup_ms},
+        }
+
+    def report(self, database_ok: bool) -> Tuple[bool, Dict[str, Any]]:
+        """Whether the worker is ready, and the /readyz body."""
+        ready = self.models_ready() and self.warmup_done and database_ok
+        return ready, {'status': 'ready' if ready else 'not ready', 'database': database_ok, **self.status()}
+
+
+readiness = Readiness()
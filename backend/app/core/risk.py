@@ -0,0 +1,227 @@
+"""
+Stage 2: rule-based Alzheimer's risk scoring from patient vitals, symptoms
+and the Prakriti type from Stage 1.
+"""
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.percentile import load_reference
+from app.core.readiness import readiness
+
+REFERENCE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                             'alzheimers_risk_dataset_stage2.csv')
+
+# Reference cohort the scores are ranked against
+percentile_index = readiness.load('risk_percentiles', lambda: load_reference(REFERENCE_CSV))
+
+PRAKRITI_MULTIPLIER = {'Vata': 1.1, 'Kapha': 1.05}
+
+# Scoring rules, shared with the vectorized scorer in data_generator.py.
+# Categorical field -> points per value (unlisted values score 0)
+CATEGORY_POINTS = {
+    'memory_loss': {'Mild': 15, 'Severe': 20},
+    'confusion': {'Sometimes': 10, 'Often': 15},
+    'language_difficulty': {'Mild': 5, 'Yes': 10},
+    'decision_making': {'Indecisive': 5, 'Poor': 10},
+    'repetition_behavior': {'Sometimes': 5, 'Yes': 8},
+    'social_withdrawal': {'Sometimes': 5, 'Yes': 7},
+    'mood_swings': {'Sometimes': 3, 'Yes': 5},
+    'stress_level': {'Medium': 5, 'High': 8},
+    'sleep_quality': {'Poor': 7},
+    'physical_activity': {'Sedentary': 5},
+    'diet_type': {'Junk': 5},
+    'chronic_conditions': {'Diabetes': 10, 'BP': 10, 'Both': 10},
+    'family_history': {'Yes': 10},
+}
+# Numeric field -> (low, high, points): points when the value is below low or above high
+RANGE_POINTS = {
+    'age': (None, 65, 10),
+    'systolic_bp': (None, 140, 5),
+    'blood_sugar': (None, 130, 5),
+    'bmi': (18, 30, 5),
+}
+
+RISK_LEVELS = ['Low', 'Medium', 'High']
+VERDICTS = ['Healthy but monitor', 'Needs attention', 'High risk, take action']
+
+def risk_points(row):
+    """Additive points before the Prakriti multiplier and the cap; every rule reads a single field."""
+    score = 0
+    for field, points in CATEGORY_POINTS.items():
+        score += points.get(row[field], 0)
+    for field, (low, high, points) in RANGE_POINTS.items():
+        value = row[field]
+        if (low is not None and value < low) or (high is not None and value > high):
+            score += points
+    return score
+
+def calculate_risk_score(row):
+    score = risk_points(row)
+    score *= PRAKRITI_MULTIPLIER.get(row['prakriti_type'], 1)
+    score = min(score, 125)
+    return round((score / 125) * 100, 2)
+
+def risk_level_codes(scores):
+    """Index into RISK_LEVELS/VERDICTS for an array of scores (41-60 is Medium, as get_risk_level)."""
+    scores = np.asarray(scores)
+    return np.where(scores <= 40, 0, np.where((scores >= 41) & (scores <= 60), 1, 2)).astype(np.int8)
+
+def get_risk_level(score):
+    return RISK_LEVELS[int(risk_level_codes(score))]
+
+def get_verdict(score):
+    return VERDICTS[int(risk_level_codes(score))]
+
+AYURVEDA_REC = {
+    'Vata': 'Brahmi, Ashwagandha, Abhyanga massage, warm diet',
+    'Pitta': 'Shankhpushpi, Gotu Kola, cooling herbs, meditation',
+    'Kapha': 'Triphala, Guggulu, Panchakarma, light diet'
+}
+
+ALLOPATHY_REC = {
+    'Low': 'Annual wellness exam, cognitive screening',
+    'Medium': 'Memory clinic referral, neurology consultation',
+    'High': 'MRI brain scan, neuropsychological testing, therapy'
+}
+
+def get_recommendations(prakriti, risk_level):
+    return AYURVEDA_REC[prakriti], ALLOPATHY_REC[risk_level]
+
+
+def assess_risk(patient: Dict[str, Any], record: bool = False) -> Dict[str, Any]:
+    """
+    Scores one patient (Stage 2 fields including prakriti_type) into the
+    /predict_risk response. With `record`, the score also joins the
+    reference cohort used for percentiles (as one of its most recent
+    PERCENTILE_MAX_RECORDED recorded scores).
+    """
+    score = calculate_risk_score(patient)
+    level = get_risk_level(score)
+    verdict = get_verdict(score)
+    ayurveda, allopathy = get_recommendations(patient['prakriti_type'], level)
+
+    response = {
+        "Risk Score (out of 100)": score,
+        "Risk Level": level,
+        "Verdict": verdict,
+        "Ayurveda Recommendations": ayurveda,
+        "Allopathy Recommendations": allopathy
+    }
+    if percentile_index is not None:
+        # Percent of the reference population (overall / same prakriti, age band, gender) scoring lower
+        response["Risk Percentile"] = percentile_index.percentiles(patient, score)
+        if record:
+            percentile_index.add(patient, score)
+    return response
+
+
+# Factors a patient can change, and the values tried for each by default
+MODIFIABLE_FACTORS = {
+    'sleep_quality': ['Good', 'Average', 'Poor'],
+    'stress_level': ['Low', 'Medium', 'High'],
+    'physical_activity': ['Active', 'Moderate', 'Sedentary'],
+    'diet_type': ['Balanced', 'Irregular', 'Junk'],
+    'systolic_bp': [120, 130, 140],
+    'blood_sugar': [90, 110, 130],
+    'bmi': [20.0, 22.0, 25.0],
+}
+NUMERIC_FACTORS = {'systolic_bp', 'blood_sugar', 'bmi'}
+# Request size limits: the scenario grid is the product of the candidate counts
+MAX_CANDIDATES_PER_FACTOR = 20
+MAX_SCENARIOS = 200_000
+
+
+def _candidate_values(patient: Dict[str, Any], factor: str, values: Optional[Sequence] = None) -> List[Any]:
+    """The patient's current value first, then the distinct alternatives to try."""
+    if factor not in MODIFIABLE_FACTORS:
+        raise ValueError(f"{factor} is not a modifiable factor")
+    values = list(values) if values else MODIFIABLE_FACTORS[factor]
+    if len(values) > MAX_CANDIDATES_PER_FACTOR:
+        raise ValueError(f"At most {MAX_CANDIDATES_PER_FACTOR} candidate values per factor, got {len(values)} for {factor}")
+    for value in values:
+        if factor in NUMERIC_FACTORS:
+            if isinstance(value, str) or not isinstance(value, (int, float)):
+                raise ValueError(f"{factor} values must be numbers, got {value!r}")
+        elif value not in MODIFIABLE_FACTORS[factor]:
+            raise ValueError(f"{factor} must be one of {MODIFIABLE_FACTORS[factor]}, got {value!r}")
+    return list(dict.fromkeys([patient[factor], *values]))
+
+
+def simulate_risk(patient: Dict[str, Any], factors: Optional[Sequence[str]] = None,
+                  candidates: Optional[Dict[str, Sequence]] = None) -> Dict[str, Any]:
+    """
+    What-if analysis: scores every combination of the candidate values of
+    `factors` (default: all modifiable factors) for one patient in a single
+    numpy pass. Raises ValueError for an empty `factors` list or a grid
+    larger than MAX_SCENARIOS. Returns the baseline, the Pareto-best changes (lowest score
+    for each number of changed factors) and each value's marginal effect,
+    both on its own and averaged over all other combinations.
+    """
+    if factors is not None and not factors:
+        raise ValueError("factors must name at least one modifiable factor")
+    factors = list(dict.fromkeys(MODIFIABLE_FACTORS if factors is None else factors))
+    candidates = candidates or {}
+    options = [_candidate_values(patient, factor, candidates.get(factor)) for factor in factors]
+    shape = tuple(len(values) for values in options)
+    if math.prod(shape) > MAX_SCENARIOS:
+        raise ValueError(f"{math.prod(shape)} scenarios requested; at most {MAX_SCENARIOS} can be simulated at once")
+
+    # Each rule reads one field, so a factor's value shifts the points by a fixed amount
+    base = risk_points(patient)
+    points = np.full(shape, float(base))
+    changed = np.zeros(shape, dtype=np.int8)
+    for axis, (factor, values) in enumerate(zip(factors, options)):
+        view = [1] * len(shape)
+        view[axis] = -1
+        delta = np.array([risk_points({**patient, factor: value}) - base for value in values], dtype=float)
+        points = points + delta.reshape(view)
+        changed = changed + (np.arange(len(values)) > 0).reshape(view)
+
+    # Same arithmetic as calculate_risk_score
+    multiplier = PRAKRITI_MULTIPLIER.get(patient['prakriti_type'], 1)
+    scores = np.round(np.minimum(points * multiplier, 125) / 125 * 100, 2)
+    baseline = float(scores.flat[0])
+
+    def scenario(flat_index: int) -> Dict[str, Any]:
+        index = np.unravel_index(flat_index, shape)
+        score = float(scores.flat[flat_index])
+        return {
+            "changes": {factor: values[i] for factor, values, i in zip(factors, options, index) if i},
+            "score": score,
+            "level": get_risk_level(score),
+            "delta": round(score - baseline, 2),
+        }
+
+    # Pareto front over (score, number of changes): the best scenario for each
+    # number of changes, kept only if it beats every scenario with fewer changes
+    flat_scores, flat_changed = scores.ravel(), changed.ravel()
+    pareto, best = [], baseline
+    for k in range(1, len(factors) + 1):
+        masked = np.where(flat_changed == k, flat_scores, np.inf)
+        flat_index = int(np.argmin(masked))
+        if masked[flat_index] < best:
+            best = float(masked[flat_index])
+            pareto.append(scenario(flat_index))
+
+    marginal = {}
+    for axis, (factor, values) in enumerate(zip(factors, options)):
+        alone_index = [0] * len(shape)
+        current_mean = np.take(scores, 0, axis=axis).mean()
+        effects = {}
+        for i, value in enumerate(values[1:], start=1):
+            alone_index[axis] = i
+            effects[value] = {
+                "alone": round(float(scores[tuple(alone_index)]) - baseline, 2),
+                "average": round(float(np.take(scores, i, axis=axis).mean() - current_mean), 2),
+            }
+        marginal[factor] = effects
+
+    return {
+        "baseline": {"score": baseline, "level": get_risk_level(baseline)},
+        "scenarios": int(scores.size),
+        "pareto": pareto,
+        "marginal": marginal,
+    }
@@ -15,6 +15,7 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 db_manager = DatabaseManager()
 
 def verify_password(plain_password, hashed_password):
@@ -50,4 +51,15 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     user = db_manager.get_user_by_id(user_id)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+def decode_token_subject(token: str) -> Optional[str]:
+    """The subject of a validly signed, unexpired JWT, else None. No database lookup."""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+def get_token_subject(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[str]:
+    """The verified JWT subject if a valid token was sent, else None."""
+    return decode_token_subject(token) if token else None
@@ -1,14 +1,43 @@
 import sqlite3
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.core import codec
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# JSON columns are only filled when the packed columns can't hold the value
+ASSESSMENTS_TABLE = '''
+    CREATE TABLE {if_not_exists}{name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        cognitive_score REAL NOT NULL,
+        prakriti_type TEXT NOT NULL,
+        prakriti_scores TEXT, -- Stored as JSON
+        scores_packed BLOB, -- Kapha/Pitta/Vata percentages, one byte each
+        risk_score REAL NOT NULL,
+        risk_level TEXT NOT NULL,
+        assessment_data TEXT, -- Stored as JSON
+        answers_packed INTEGER, -- Prakriti answers, see app.core.codec
+        vitals_packed BLOB, -- Stage 2 patient attributes, see app.core.codec
+        ml_prediction TEXT, -- Stored as JSON, NULL when empty
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+'''
+
+def _load_json(text: str) -> Any:
+    """Parses a JSON column; legacy text that isn't valid JSON is returned unchanged."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
 class DatabaseManager:
     """Manages all database operations for the Care Catalyst application."""
     
@@ -51,21 +80,10 @@ class DatabaseManager:
             ''')
             
             # Assessments table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS assessments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    cognitive_score REAL NOT NULL,
-                    prakriti_type TEXT NOT NULL,
-                    prakriti_scores TEXT NOT NULL, -- Stored as JSON
-                    risk_score REAL NOT NULL,
-                    risk_level TEXT NOT NULL,
-                    assessment_data TEXT NOT NULL, -- Stored as JSON
-                    ml_prediction TEXT, -- Stored as JSON
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            ''')
+            cursor.execute(ASSESSMENTS_TABLE.format(if_not_exists='IF NOT EXISTS ', name='assessments'))
+            migrated = self._migrate_packed_assessments(conn)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assessments_user ON assessments (user_id, created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assessments_packed ON assessments (answers_packed, vitals_packed)')
             
             # Recommendations table
             cursor.execute('''
@@ -97,6 +115,23 @@ class DatabaseManager:
                 )
             ''')
             
+            # Stored responses for retried requests, see app.core.idempotency
+            idempotency_columns = {row['name']: row for row in cursor.execute('PRAGMA table_info(idempotency_keys)')}
+            if idempotency_columns and idempotency_columns['response']['notnull']:
+                # Table from before pending claims; it only caches replays, so rebuild it
+                cursor.execute('DROP TABLE idempotency_keys')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS idempotency_keys (
+                    idempotency_key TEXT NOT NULL,
+                    scope TEXT NOT NULL, -- endpoint (and user) the key belongs to
+                    request_hash TEXT NOT NULL,
+                    response TEXT, -- Stored as JSON, NULL while the claiming request is still running
+                    expires_at REAL NOT NULL, -- Unix time; for a pending claim, when its lease runs out
+                    PRIMARY KEY (idempotency_key, scope)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys (expires_at)')
+            
             # System logs table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS system_logs (
@@ -112,10 +147,124 @@ class DatabaseManager:
             ''')
             
             conn.commit()
-        
+
+        if migrated:
+            # Reclaim the pages freed by dropping the JSON blobs
+            conn = self.get_connection()
+            conn.execute('VACUUM')
+            conn.close()
+
         self._create_default_users()
         logger.info("Database checked and initialized successfully.")
     
+    def _migrate_packed_assessments(self, conn: sqlite3.Connection) -> bool:
+        """
+        Rebuilds an assessments table from before packed storage: the JSON
+        columns become nullable and every row the codec can represent is
+        re-encoded into the packed columns. Returns True if a migration ran.
+
+        The new table is built beside the old one and swapped in by name
+        (renaming the old table would make SQLite rewrite the foreign keys
+        of recommendations/user_progress to point at it), all in one
+        transaction, so a failure leaves the legacy table untouched. Rows
+        whose JSON doesn't parse are copied verbatim and logged.
+        """
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(assessments)')}
+        if 'answers_packed' in columns:
+            return False
+
+        logger.info("Migrating assessments table to packed storage...")
+        conn.commit()
+        foreign_keys = conn.execute('PRAGMA foreign_keys').fetchone()[0]
+        conn.execute('PRAGMA foreign_keys = OFF')  # no-op inside a transaction, so set before BEGIN
+        try:
+            conn.execute('BEGIN')
+            try:
+                violations_before = set(map(tuple, conn.execute('PRAGMA foreign_key_check')))
+                conn.execute(ASSESSMENTS_TABLE.format(if_not_exists='', name='assessments_new'))
+                rows = conn.execute('SELECT * FROM assessments').fetchall()
+                unreadable = []
+                values = []
+                for row in rows:
+                    try:
+                        packed = self._pack_assessment_columns(
+                            json.loads(row['prakriti_scores']), json.loads(row['assessment_data']),
+                            json.loads(row['ml_prediction'] or '{}'))
+                    except (TypeError, ValueError):
+                        unreadable.append(row['id'])
+                        packed = (row['prakriti_scores'], None, row['assessment_data'], None, None, row['ml_prediction'])
+                    values.append((row['id'], row['user_id'], row['cognitive_score'], row['prakriti_type'],
+                                   row['risk_score'], row['risk_level'], row['created_at'], *packed))
+                conn.executemany('''
+                    INSERT INTO assessments_new (id, user_id, cognitive_score, prakriti_type, risk_score, risk_level, created_at,
+                        prakriti_scores, scores_packed, assessment_data, answers_packed, vitals_packed, ml_prediction)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values)
+                conn.execute('DROP TABLE assessments')
+                conn.execute('ALTER TABLE assessments_new RENAME TO assessments')
+                violations = set(map(tuple, conn.execute('PRAGMA foreign_key_check'))) - violations_before
+                if violations:
+                    raise sqlite3.IntegrityError(f"foreign key violations after migration: {sorted(violations)}")
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.execute(f'PRAGMA foreign_keys = {int(foreign_keys)}')
+
+        if unreadable:
+            logger.warning(f"Kept {len(unreadable)} assessments with unreadable JSON as-is: ids {unreadable}")
+        logger.info(f"Migrated {len(rows)} assessments to packed storage.")
+        return True
+
+    @staticmethod
+    def _pack_assessment_columns(prakriti_scores, raw_data, ml_prediction):
+        """
+        Returns the (prakriti_scores, scores_packed, assessment_data,
+        answers_packed, vitals_packed, ml_prediction) column values, falling
+        back to JSON per field when the codec can't represent it (as with
+        the question1/question2 placeholders /assessment/submit sends today).
+        """
+        scores_packed = codec.pack_dosha_scores(prakriti_scores)
+        packed = codec.encode_assessment(raw_data)
+        answers_packed, vitals_packed = packed if packed else (None, None)
+        return (
+            None if scores_packed is not None else json.dumps(prakriti_scores),
+            scores_packed,
+            None if packed else json.dumps(raw_data),
+            answers_packed,
+            vitals_packed,
+            json.dumps(ml_prediction) if ml_prediction else None,
+        )
+
+    @staticmethod
+    def _unpack_assessment_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Turns an assessments row back into the dict shape callers expect."""
+        assessment = dict(row)
+        scores_packed = assessment.pop('scores_packed')
+        answers_packed = assessment.pop('answers_packed')
+        vitals_packed = assessment.pop('vitals_packed')
+        if scores_packed is not None:
+            assessment['prakriti_scores'] = codec.unpack_dosha_scores(scores_packed)
+        else:
+            assessment['prakriti_scores'] = _load_json(assessment['prakriti_scores'])
+        if assessment['assessment_data'] is None:
+            assessment['assessment_data'] = codec.decode_assessment(answers_packed, vitals_packed)
+        else:
+            assessment['assessment_data'] = _load_json(assessment['assessment_data'])
+        assessment['ml_prediction'] = _load_json(assessment['ml_prediction'] or '{}')
+        return assessment
+
+    def ping(self) -> bool:
+        """True if the database file can be opened and queried."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('SELECT 1').fetchone()
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+
     def _create_default_users(self):
         """Creates default admin and test users if they don't already exist."""
         try:
@@ -177,18 +326,31 @@ class DatabaseManager:
             logger.error(f"Error getting user by ID {user_id}: {e}")
             return None
             
+    def get_user_version(self, user_id: int) -> Optional[str]:
+        """Returns the user's updated_at, a cheap version for conditional profile reads."""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute('SELECT updated_at FROM users WHERE id = ?', (user_id,)).fetchone()
+                return row['updated_at'] if row else None
+        except Exception as e:
+            logger.error(f"Error getting version of user ID {user_id}: {e}")
+            return None
+
     def save_assessment(self, assessment_data: Dict[str, Any]) -> Optional[int]:
         """Saves assessment results and returns the new assessment ID."""
         try:
+            prakriti_scores, scores_packed, raw_json, answers_packed, vitals_packed, ml_prediction = \
+                self._pack_assessment_columns(assessment_data['prakriti_scores'], assessment_data['raw_data'],
+                                              assessment_data.get('ml_prediction', {}))
             with self.get_connection() as conn:
                 cursor = conn.execute('''
-                    INSERT INTO assessments (user_id, cognitive_score, prakriti_type, prakriti_scores, risk_score, risk_level, assessment_data, ml_prediction) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO assessments (user_id, cognitive_score, prakriti_type, prakriti_scores, scores_packed, risk_score, risk_level, assessment_data, answers_packed, vitals_packed, ml_prediction) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     assessment_data['user_id'], assessment_data['cognitive_score'],
-                    assessment_data['prakriti_type'], json.dumps(assessment_data['prakriti_scores']),
+                    assessment_data['prakriti_type'], prakriti_scores, scores_packed,
                     assessment_data['risk_score'], assessment_data['risk_level'],
-                    json.dumps(assessment_data['raw_data']), json.dumps(assessment_data.get('ml_prediction', {}))
+                    raw_json, answers_packed, vitals_packed, ml_prediction
                 ))
                 assessment_id = cursor.lastrowid
                 conn.commit()
@@ -204,12 +366,7 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 assessment_row = conn.execute('SELECT * FROM assessments WHERE id = ? AND user_id = ?', (assessment_id, user_id)).fetchone()
                 if assessment_row:
-                    assessment = dict(assessment_row)
-                    # Deserialize JSON fields back into Python objects
-                    assessment['prakriti_scores'] = json.loads(assessment['prakriti_scores'])
-                    assessment['assessment_data'] = json.loads(assessment['assessment_data'])
-                    assessment['ml_prediction'] = json.loads(assessment['ml_prediction'] or '{}')
-                    return assessment
+                    return self._unpack_assessment_row(assessment_row)
                 return None
         except Exception as e:
             logger.error(f"Error getting assessment ID {assessment_id}: {e}")
@@ -220,15 +377,120 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 assessments_rows = conn.execute('SELECT * FROM assessments WHERE user_id = ? ORDER BY created_at DESC', (user_id,)).fetchall()
-                assessments = []
-                for row in assessments_rows:
-                    assessment = dict(row)
-                    # Deserialize JSON fields
-                    assessment['prakriti_scores'] = json.loads(assessment['prakriti_scores'])
-                    assessment['assessment_data'] = json.loads(assessment['assessment_data'])
-                    assessment['ml_prediction'] = json.loads(assessment['ml_prediction'] or '{}')
-                    assessments.append(assessment)
-                return assessments
+                return [self._unpack_assessment_row(row) for row in assessments_rows]
         except Exception as e:
             logger.error(f"Error getting assessments for user ID {user_id}: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_assessments_version(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns {'count', 'latest_id', 'latest_at'} for a user's assessments,
+        read from the (user_id, created_at) index without touching the rows.
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    'SELECT COUNT(*) AS count, MAX(id) AS latest_id, MAX(created_at) AS latest_at '
+                    'FROM assessments WHERE user_id = ?', (user_id,)
+                ).fetchone()
+                return dict(row)
+        except Exception as e:
+            logger.error(f"Error getting assessments version for user ID {user_id}: {e}")
+            return None
+
+    def find_duplicate_assessment(self, raw_data: Dict[str, Any], user_id: Optional[int] = None) -> Optional[int]:
+        """
+        Returns the ID of the most recent assessment with exactly the same
+        answers (optionally for one user), using the packed-column index.
+        """
+        packed = codec.encode_assessment(raw_data)
+        if packed is None:
+            return None
+        answers_packed, vitals_packed = packed
+        try:
+            with self.get_connection() as conn:
+                query = 'SELECT id FROM assessments WHERE answers_packed IS ? AND vitals_packed IS ?'
+                params = [answers_packed, vitals_packed]
+                if user_id is not None:
+                    query += ' AND user_id = ?'
+                    params.append(user_id)
+                row = conn.execute(query + ' ORDER BY id DESC LIMIT 1', params).fetchone()
+                return row['id'] if row else None
+        except Exception as e:
+            logger.error(f"Error looking up duplicate assessment: {e}")
+            return None
+
+    def get_idempotent_response(self, key: str, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the unexpired row for an Idempotency-Key as {'request_hash',
+        'response', 'pending'}; a pending row is a claim whose request is
+        still running (response None).
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    'SELECT request_hash, response FROM idempotency_keys '
+                    'WHERE idempotency_key = ? AND scope = ? AND expires_at > ?',
+                    (key, scope, time.time())
+                ).fetchone()
+                if row:
+                    pending = row['response'] is None
+                    return {'request_hash': row['request_hash'], 'pending': pending,
+                            'response': None if pending else json.loads(row['response'])}
+                return None
+        except Exception as e:
+            logger.error(f"Error getting idempotent response for key {key}: {e}")
+            return None
+
+    def claim_idempotency_key(self, key: str, scope: str, request_hash: str, lease_seconds: float) -> Optional[bool]:
+        """
+        Inserts a pending row for an Idempotency-Key and drops expired ones.
+        Returns True if this caller now owns the key, False if another
+        request (in any process) already holds it, None on database errors.
+        """
+        try:
+            now = time.time()
+            with self.get_connection() as conn:
+                conn.execute('DELETE FROM idempotency_keys WHERE expires_at <= ?', (now,))
+                conn.execute(
+                    'INSERT INTO idempotency_keys (idempotency_key, scope, request_hash, response, expires_at) '
+                    'VALUES (?, ?, ?, NULL, ?)',
+                    (key, scope, request_hash, now + lease_seconds)
+                )
+                conn.commit()
+                return True
+        except sqlite3.IntegrityError:
+            return False
+        except Exception as e:
+            logger.error(f"Error claiming idempotency key {key}: {e}")
+            return None
+
+    def save_idempotent_response(self, key: str, scope: str, request_hash: str, response: Any, ttl_seconds: float) -> bool:
+        """Stores the completed response on a claimed Idempotency-Key."""
+        try:
+            with self.get_connection() as conn:
+                # Upsert: the claim may already have been purged if its lease ran out
+                conn.execute(
+                    'INSERT INTO idempotency_keys (idempotency_key, scope, request_hash, response, expires_at) '
+                    'VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT (idempotency_key, scope) DO UPDATE SET '
+                    'request_hash = excluded.request_hash, response = excluded.response, expires_at = excluded.expires_at',
+                    (key, scope, request_hash, json.dumps(response, default=str), time.time() + ttl_seconds)
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error saving idempotent response for key {key}: {e}")
+            return False
+
+    def release_idempotency_key(self, key: str, scope: str) -> bool:
+        """Drops a pending claim after its request failed, so the client can retry."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('DELETE FROM idempotency_keys WHERE idempotency_key = ? AND scope = ? AND response IS NULL',
+                             (key, scope))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error releasing idempotency key {key}: {e}")
+            return False
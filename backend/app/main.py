@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth_router, assessment_router, dashboard_router, admin_router # Import all your routers
+from fastapi.responses import JSONResponse
+from app.core import admission, drift
+from app.core.readiness import readiness
+from app.database import DatabaseManager
+from app.routers import auth_router, assessment_router, prakriti_router, facility_router, screening_router
 
-app = FastAPI(title="Care Catalyst - FastAPI Backend")
+db_manager = DatabaseManager()
 
-# Add CORS Middleware
-origins = ["http://localhost:3000", "http://localhost:5173"]
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models are loaded on import; run representative predictions in the
+    # background so /healthz answers right away and /readyz flips once warm
+    readiness.start_warm_up()
+    yield
+
+app = FastAPI(title="Care Catalyst Backend", lifespan=lifespan)
+
+# CORS Middleware
+origins = [
+    "http://localhost:3000",
+    "http://localhost:5173",  # Frontend URL
+    "http://127.0.0.1:5173",
+    "http://localhost:5174",
+    "http://127.0.0.1:5174",
+]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -16,10 +36,34 @@ app.add_middleware(
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the Care Catalyst API"}
+    return {"message": "Welcome to Care Catalyst API"}
+
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: every model loaded, warm-up finished and the database reachable. 503 until then."""
+    ready, body = readiness.report(db_manager.ping())
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+@app.get("/admission/stats")
+def admission_stats():
+    """In-flight, waiting, admitted, queued and shed request counts per protected endpoint."""
+    return {name: controller.stats() for name, controller in admission.controllers.items()}
+
+@app.get("/drift")
+def drift_report():
+    """PSI and chi-square of recent prediction inputs against the training data, per feature."""
+    if drift.monitor is None:
+        return JSONResponse({"detail": "Drift baseline is not loaded"}, status_code=503)
+    return drift.monitor.report()
 
-# Include all routers
-app.include_router(auth_router.router, prefix="/api")
-app.include_router(assessment_router.router, prefix="/api")
-app.include_router(dashboard_router.router, prefix="/api")
-app.include_router(admin_router.router, prefix="/api")
\ No newline at end of file
+# Include all routers (each router carries its own prefix)
+app.include_router(auth_router.router)
+app.include_router(assessment_router.router)
+app.include_router(prakriti_router.router)
+app.include_router(facility_router.router)
+app.include_router(screening_router.router)
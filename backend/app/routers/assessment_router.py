@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-import json
-from app.core.database import DatabaseManager
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from typing import Optional
 from app.core.security import get_current_user
+from app.core.conditional import is_not_modified, make_etag, not_modified, parse_db_timestamp, validator_headers
+from app.async_database import AsyncDatabaseManager
 from app.core import analysis # Import your analysis logic
 from app.schemas.assessment_schema import AssessmentData # Make sure you have this schema
+from app.core.idempotency import IdempotencyRegistry
+from app import database
 
 router = APIRouter(prefix="/assessment", tags=["Assessments"])
-db_manager = DatabaseManager()
+# Submissions are written to the SQLite assessments table that /history reads
+db_manager = database.DatabaseManager()
+# Retried submissions with the same Idempotency-Key get the first response back instead of a new assessment
+idempotency = IdempotencyRegistry(db_manager)
+# Stored assessments, read from async handlers
+assessments_db = AsyncDatabaseManager()
 
 @router.post("/submit")
-def submit_assessment(data: AssessmentData, current_user: dict = Depends(get_current_user)):
+def submit_assessment(data: AssessmentData, current_user: dict = Depends(get_current_user),
+                      idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    # Keys are scoped per user so two users can't replay each other's results
+    scope = f"assessment.submit:{current_user['id']}"
+    return idempotency.run(idempotency_key, scope, data.dict(), lambda: _submit(data, current_user))
+
+def _submit(data: AssessmentData, current_user: dict):
     user_id = current_user['id']
     assessment_data_dict = data.dict()
     
@@ -23,12 +37,14 @@ def submit_assessment(data: AssessmentData, current_user: dict = Depends(get_cur
         "user_id": user_id,
         "cognitive_score": cognitive_score,
         "prakriti_type": prakriti_analysis['type'],
-        "prakriti_scores": json.dumps(prakriti_analysis['scores']),
+        "prakriti_scores": prakriti_analysis['scores'],
         "risk_score": risk_analysis['score'],
         "risk_level": risk_analysis['level'],
-        "assessment_data": json.dumps(assessment_data_dict)
+        "raw_data": assessment_data_dict
     }
-    assessment_id = db_manager.save_assessment(db_assessment_data) # Ensure your save_assessment is updated to accept these fields
+    assessment_id = db_manager.save_assessment(db_assessment_data)
+    if assessment_id is None:
+        raise HTTPException(status_code=500, detail="Could not save the assessment")
     
     # 3. Generate and save recommendations
     recommendations = analysis.generate_recommendations(prakriti_analysis['type'], risk_analysis['level'])
@@ -44,4 +60,19 @@ def submit_assessment(data: AssessmentData, current_user: dict = Depends(get_cur
         }
     }
 
+@router.get("/history")
+async def get_assessment_history(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    # Polling fast path: the history only changes when an assessment is added or removed,
+    # so count + latest id identify it; answer 304 before loading and decoding the rows
+    user_id = current_user['id']
+    version = await assessments_db.get_assessments_version(user_id)
+    if version is not None:
+        etag = make_etag("history", user_id, version['count'], version['latest_id'])
+        last_modified = parse_db_timestamp(version['latest_at'])
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        response.headers.update(validator_headers(etag, last_modified))
+
+    return await assessments_db.get_user_assessments(user_id)
+
 # Add the get_assessment_results endpoint here as well...
\ No newline at end of file
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from ..core.database import DatabaseManager
-from app.core.security import create_access_token, get_password_hash, verify_password, get_current_user
+from app.core import security
+from app.core.security import create_access_token, get_password_hash, verify_password, get_current_user, decode_token_subject, oauth2_scheme
+from app.core.conditional import is_not_modified, make_etag, not_modified, parse_db_timestamp, validator_headers
 from app.schemas.user_schema import UserCreate, UserPublic # Make sure you have these schemas
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -33,6 +35,13 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/profile", response_model=UserPublic)
-def get_profile(current_user: dict = Depends(get_current_user)):
-    # The dependency already gets the user for us
-    return current_user
\ No newline at end of file
+async def get_profile(request: Request, response: Response, token: str = Depends(oauth2_scheme)):
+    # Polling fast path: answer 304 from the token and the profile version alone, before loading the user
+    user_id = decode_token_subject(token)
+    version = security.db_manager.get_user_version(user_id) if user_id else None
+    if version is not None:
+        etag, last_modified = make_etag("profile", user_id, version), parse_db_timestamp(version)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        response.headers.update(validator_headers(etag, last_modified))
+    return await get_current_user(token)
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from app.core.geo_index import FacilityIndex, load_facilities
+from app.core.readiness import readiness
+from app.schemas.facility_schema import Facility
+import os
+
+# Facilities dataset: one row per hospital or specialist, indexed once at startup
+FACILITIES_CSV = os.environ.get('FACILITIES_CSV') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'facilities.csv')
+facility_index = readiness.load('facility_index', lambda: load_facilities(FACILITIES_CSV))
+if facility_index is not None:
+    readiness.add_warmup('facility_index', lambda: (facility_index.nearest(22.31, 73.18, 10),
+                                                    facility_index.search('hos', 10)))
+
+router = APIRouter(prefix="/facilities", tags=["Hospital Finder"])
+
+def get_facility_index() -> FacilityIndex:
+    # A load failure is already recorded by readiness (/readyz); answer 503 rather than crash
+    if facility_index is None:
+        raise HTTPException(status_code=503, detail="Facility index is unavailable")
+    return facility_index
+
+@router.get("/nearest", response_model=List[Facility])
+def nearest_facilities(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(10, ge=1, le=100),
+    specialty: Optional[str] = None,
+    kind: Optional[str] = Query(None, description="'hospital' or 'doctor'"),
+    index: FacilityIndex = Depends(get_facility_index),
+):
+    return index.nearest(lat, lng, limit=limit, specialty=specialty, kind=kind)
+
+@router.get("/within", response_model=List[Facility])
+def facilities_within(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=500),
+    specialty: Optional[str] = None,
+    kind: Optional[str] = None,
+    index: FacilityIndex = Depends(get_facility_index),
+):
+    return index.within(lat, lng, radius_km, limit=limit, specialty=specialty, kind=kind)
+
+@router.get("/search", response_model=List[Facility])
+def search_facilities(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    index: FacilityIndex = Depends(get_facility_index),
+):
+    # Prefix match on name words and specialties, for the search box
+    return index.search(q, limit=limit, lat=lat, lng=lng)
+
+@router.get("/specialties", response_model=List[str])
+def list_specialties(index: FacilityIndex = Depends(get_facility_index)):
+    return index.specialties
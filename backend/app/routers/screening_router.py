@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional
+from app.schemas.prakriti_schema import PrakritiInput
+from app.schemas.risk_schema import PatientInput, ScreeningInput, WhatIfInput
+from app.core import drift, prakriti, risk
+from app.core.admission import AdmissionController
+from app.core.idempotency import IdempotencyRegistry
+from app.database import DatabaseManager
+
+router = APIRouter(tags=["Screening"])
+
+# Replays responses for retried requests that carry an Idempotency-Key
+idempotency = IdempotencyRegistry(DatabaseManager())
+
+# Per-caller rate limit and in-flight cap for each endpoint, see app.core.admission
+screening_admission = AdmissionController("screening")
+prakriti_admission = AdmissionController("predict_prakriti")
+risk_admission = AdmissionController("predict_risk")
+simulate_admission = AdmissionController("simulate_risk")
+
+@router.post("/screening", dependencies=[Depends(screening_admission)])
+def full_screening(input_data: ScreeningInput, explain: bool = False,
+                   idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """Stage 1 Prakriti inference feeding straight into Stage 2 risk scoring, in one round trip."""
+    payload = {**input_data.dict(), "explain": explain}
+    return idempotency.run(idempotency_key, "screening", payload, lambda: _screen(input_data, explain))
+
+def _screen(input_data: ScreeningInput, explain: bool):
+    answers, patient = input_data.questionnaire.dict(), input_data.patient.dict()
+    try:
+        prakriti_result = prakriti.predict_prakriti(answers, explain=explain)
+        prakriti_type = prakriti.dominant_dosha(prakriti_result["Prakriti_Score"])
+        patient["prakriti_type"] = prakriti_type
+        drift.observe({**answers, **patient})
+        # A completed screening is a real assessment, so it joins the percentile reference cohort
+        risk_result = risk.assess_risk(patient, record=True)
+        return {"Prakriti_Type": prakriti_type, "Prakriti": prakriti_result, "Risk": risk_result}
+    except prakriti.ExplanationUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred during screening: {str(e)}")
+
+# Routes of the former standalone apps (backend/main.py and Stage2.py), kept for existing clients
+
+@router.post("/predict_prakriti", tags=["Prakriti Analysis"], dependencies=[Depends(prakriti_admission)])
+def predict_prakriti(input_data: PrakritiInput):
+    answers = input_data.dict()
+    drift.observe(answers)
+    return prakriti.predict_prakriti(answers, legacy_format=True)
+
+@router.post("/predict_risk", tags=["Risk Assessment"], dependencies=[Depends(risk_admission)])
+def predict_risk(input: PatientInput):
+    patient = input.dict()
+    drift.observe(patient)
+    return risk.assess_risk(patient)
+
+@router.post("/predict_risk/simulate", tags=["Risk Assessment"], dependencies=[Depends(simulate_admission)])
+def simulate_risk(input_data: WhatIfInput):
+    """What-if: every combination of lifestyle changes scored at once, with the Pareto-best changes."""
+    try:
+        return risk.simulate_risk(input_data.patient.dict(), input_data.factors, input_data.candidates)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
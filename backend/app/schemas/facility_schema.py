@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class Facility(BaseModel):
+    id: str
+    kind: str
+    name: str
+    address: str
+    phone: str
+    lat: float
+    lng: float
+    rating: float
+    specialties: List[str]
+    emergency: bool
+    hours: str
+    distance_km: Optional[float] = None
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, conlist
+from typing import Dict, Literal, Optional, Union
+from app.schemas.prakriti_schema import PrakritiInput
+from app.core.risk import MAX_CANDIDATES_PER_FACTOR
+
+class PatientVitals(BaseModel):
+    age: int
+    gender: Literal["Male", "Female"]
+    diet_type: str
+    sleep_quality: str
+    stress_level: str
+    physical_activity: str
+    memory_loss: str
+    confusion: str
+    language_difficulty: str
+    decision_making: str
+    repetition_behavior: str
+    social_withdrawal: str
+    mood_swings: str
+    chronic_conditions: str
+    systolic_bp: int
+    blood_sugar: int
+    bmi: float
+    family_history: Literal["Yes", "No"]
+
+class PatientInput(PatientVitals):
+    prakriti_type: Literal["Vata", "Pitta", "Kapha"]
+
+class ScreeningInput(BaseModel):
+    """Full screening: the Stage 1 questionnaire plus the Stage 2 patient data (prakriti_type comes from Stage 1)."""
+    questionnaire: PrakritiInput
+    patient: PatientVitals
+
+ModifiableFactor = Literal["sleep_quality", "stress_level", "physical_activity", "diet_type",
+                           "systolic_bp", "blood_sugar", "bmi"]
+
+class WhatIfInput(BaseModel):
+    """Risk simulation: which of `factors` (default: all) to vary, optionally with custom values to try."""
+    patient: PatientInput
+    factors: Optional[conlist(ModifiableFactor, min_length=1)] = None
+    candidates: Dict[ModifiableFactor, conlist(Union[float, str], max_length=MAX_CANDIDATES_PER_FACTOR)] = {}
@@ -0,0 +1,83 @@
+"""
+Overload behaviour of a prediction-sized endpoint with and without admission
+control: a burst of simultaneous requests from many users hits a `def`
+handler that burns ~20 ms of CPU (about one predict_proba call).
+
+Usage (from backend/):
+    python -m benchmarks.bench_admission [--clients 1000] [--users 200] [--work-ms 20]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+
+from app.core.admission import AdmissionController
+from app.core.security import create_access_token
+
+
+def build_app(work_ms):
+    app = FastAPI()
+    admission = AdmissionController("bench", rate=5, burst=20, max_in_flight=4, max_queue=32, queue_timeout=1.0)
+
+    def work():
+        end = time.perf_counter() + work_ms / 1e3
+        while time.perf_counter() < end:
+            pass
+        return {"ok": True}
+
+    @app.post("/unprotected")
+    def unprotected():
+        return work()
+
+    @app.post("/protected", dependencies=[Depends(admission)])
+    def protected():
+        return work()
+
+    return app, admission
+
+
+async def burst(client, path, tokens, clients):
+    async def one(i):
+        start = time.perf_counter()
+        response = await client.post(path, headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+        return response.status_code, time.perf_counter() - start, response.headers.get("retry-after")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(clients)))
+    return results, time.perf_counter() - start
+
+
+async def main_async(args):
+    app, admission = build_app(args.work_ms)
+    tokens = [create_access_token({"sub": str(user)}) for user in range(args.users)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"{args.clients} simultaneous requests from {args.users} users, {args.work_ms} ms CPU each")
+        for path in ("/unprotected", "/protected"):
+            results, elapsed = await burst(client, path, tokens, args.clients)
+            statuses = Counter(status for status, _, _ in results)
+            ok = np.array([latency for status, latency, _ in results if status == 200]) * 1e3
+            rejected = np.array([latency for status, latency, _ in results if status != 200]) * 1e3
+            line = f"{path:<13} {dict(statuses)}   served p50 {np.percentile(ok, 50):6.0f} ms  p99 {np.percentile(ok, 99):6.0f} ms"
+            if len(rejected):
+                line += f"   rejected p99 {np.percentile(rejected, 99):5.1f} ms"
+                assert all(retry for status, _, retry in results if status != 200)
+            print(line + f"   wall {elapsed:.1f} s")
+    print("admission stats:", admission.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--work-ms', type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Compares the legacy JSON assessments table with packed storage.
+
+Fills a database in the old JSON layout from the bundled CSVs, times history
+reads, then lets DatabaseManager migrate it and times the same reads again.
+
+Usage (from backend/):
+    python -m benchmarks.bench_assessment_storage [--users 200] [--per-user 50]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from app.database import DatabaseManager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEGACY_ASSESSMENTS_TABLE = '''
+    CREATE TABLE assessments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        cognitive_score REAL NOT NULL,
+        prakriti_type TEXT NOT NULL,
+        prakriti_scores TEXT NOT NULL,
+        risk_score REAL NOT NULL,
+        risk_level TEXT NOT NULL,
+        assessment_data TEXT NOT NULL,
+        ml_prediction TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def load_rows(count):
+    answers = pd.read_csv(os.path.join(BACKEND_DIR, 'synthetic_data.csv')).drop(columns=['Dosha'])
+    patients = pd.read_csv(os.path.join(BACKEND_DIR, 'alzheimers_risk_dataset_stage2.csv'), keep_default_na=False)
+    patients = patients[['prakriti_type', 'age', 'gender', 'diet_type', 'sleep_quality', 'stress_level',
+                         'physical_activity', 'memory_loss', 'confusion', 'language_difficulty', 'decision_making',
+                         'repetition_behavior', 'social_withdrawal', 'mood_swings', 'chronic_conditions',
+                         'systolic_bp', 'blood_sugar', 'bmi', 'family_history', 'risk_score', 'risk_level']]
+    answers = answers.to_dict('records')
+    patients = json.loads(patients.to_json(orient='records'))
+    for i in range(count):
+        patient = dict(patients[i % len(patients)])
+        risk_score, risk_level = patient.pop('risk_score'), patient.pop('risk_level')
+        yield {**answers[i % len(answers)], **patient}, risk_score, risk_level
+
+
+def build_legacy_db(path, users, per_user):
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_ASSESSMENTS_TABLE)
+    conn.executemany(
+        'INSERT INTO assessments (user_id, cognitive_score, prakriti_type, prakriti_scores, risk_score, risk_level, '
+        'assessment_data, ml_prediction) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        [
+            (i % users + 1, 0.0, raw['prakriti_type'], json.dumps({'Kapha': 20, 'Pitta': 70, 'Vata': 10}),
+             risk_score, risk_level, json.dumps(raw), json.dumps({}))
+            for i, (raw, risk_score, risk_level) in enumerate(load_rows(users * per_user))
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_history_reads(read, users, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for user_id in range(1, users + 1):
+            read(user_id)
+        best = min(best, time.perf_counter() - start)
+    return best / users
+
+
+def legacy_history_reader(path):
+    def read(user_id):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('SELECT * FROM assessments WHERE user_id = ? ORDER BY created_at DESC', (user_id,)).fetchall()
+        result = []
+        for row in rows:
+            assessment = dict(row)
+            assessment['prakriti_scores'] = json.loads(assessment['prakriti_scores'])
+            assessment['assessment_data'] = json.loads(assessment['assessment_data'])
+            assessment['ml_prediction'] = json.loads(assessment['ml_prediction'] or '{}')
+            result.append(assessment)
+        conn.close()
+        return result
+    return read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--per-user', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        build_legacy_db(path, args.users, args.per_user)
+        # VACUUM the legacy file too so both sizes are compact
+        conn = sqlite3.connect(path)
+        conn.execute('VACUUM')
+        conn.close()
+        legacy_size = os.path.getsize(path)
+        legacy_read = time_history_reads(legacy_history_reader(path), args.users)
+
+        start = time.perf_counter()
+        db = DatabaseManager(path)
+        migrate_time = time.perf_counter() - start
+        packed_size = os.path.getsize(path)
+        packed_read = time_history_reads(db.get_user_assessments, args.users)
+
+        sample = next(load_rows(1))[0]
+        start = time.perf_counter()
+        for _ in range(1000):
+            db.find_duplicate_assessment(sample)
+        dup_lookup = (time.perf_counter() - start) / 1000
+
+    rows = args.users * args.per_user
+    print(f"{rows} assessments, {args.users} users x {args.per_user}")
+    print(f"database size:   JSON {legacy_size / 1024:.0f} KiB -> packed {packed_size / 1024:.0f} KiB "
+          f"({legacy_size / packed_size:.1f}x smaller)")
+    print(f"history read:    JSON {legacy_read * 1e3:.2f} ms -> packed {packed_read * 1e3:.2f} ms per user")
+    print(f"migration:       {migrate_time:.2f} s")
+    print(f"duplicate check: {dup_lookup * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
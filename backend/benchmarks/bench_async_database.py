@@ -0,0 +1,106 @@
+"""
+1,000 simultaneous clients reading assessment history through the sync
+DatabaseManager (plain `def` handler) and through AsyncDatabaseManager
+(`async def` handler), while another client polls an unrelated `def`
+endpoint that only needs a threadpool slot.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_database [--clients 1000] [--per-user 50]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+from app.async_database import AsyncDatabaseManager
+from app.database import DatabaseManager
+from benchmarks.bench_assessment_storage import load_rows
+
+USERS = 20
+
+
+def seed(db, per_user):
+    for i, (raw, risk_score, risk_level) in enumerate(load_rows(USERS * per_user)):
+        db.save_assessment({
+            'user_id': i % USERS + 1, 'cognitive_score': 0.0, 'prakriti_type': raw['prakriti_type'],
+            'prakriti_scores': {'Kapha': 20, 'Pitta': 70, 'Vata': 10}, 'risk_score': risk_score,
+            'risk_level': risk_level, 'raw_data': raw,
+        })
+
+
+def build_app(sync_db, async_db):
+    app = FastAPI()
+
+    @app.get("/sync/history/{user_id}")
+    def sync_history(user_id: int):
+        return len(sync_db.get_user_assessments(user_id))
+
+    @app.get("/async/history/{user_id}")
+    async def async_history(user_id: int):
+        return len(await async_db.get_user_assessments(user_id))
+
+    @app.get("/ping")
+    def ping():
+        return "pong"
+
+    return app
+
+
+async def run_load(client, mode, clients):
+    ping_latencies = []
+
+    async def pinger(stop):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            ping_latencies.append(time.perf_counter() - start)
+
+    async def one_client(i):
+        start = time.perf_counter()
+        response = await client.get(f"/{mode}/history/{i % USERS + 1}")
+        assert response.status_code == 200, response.text
+        return time.perf_counter() - start
+
+    stop = asyncio.Event()
+    ping_task = asyncio.create_task(pinger(stop))
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one_client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ping_task
+    return elapsed, np.array(latencies) * 1e3, np.array(ping_latencies) * 1e3
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        sync_db = DatabaseManager(path)
+        seed(sync_db, args.per_user)
+        async_db = AsyncDatabaseManager(path)
+        transport = httpx.ASGITransport(app=build_app(sync_db, async_db))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{args.clients} simultaneous clients, {args.per_user} assessments per history read")
+            for mode in ('sync', 'async'):
+                await run_load(client, mode, 50)  # warm up
+                elapsed, latencies, pings = await run_load(client, mode, args.clients)
+                print(f"{mode:>5}: {args.clients / elapsed:7.0f} req/s   "
+                      f"p50 {np.percentile(latencies, 50):7.1f} ms   p99 {np.percentile(latencies, 99):7.1f} ms   "
+                      f"unrelated /ping p99 {np.percentile(pings, 99):7.1f} ms")
+        await async_db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--per-user', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
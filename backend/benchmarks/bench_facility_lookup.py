@@ -0,0 +1,114 @@
+"""
+Latency of FacilityIndex queries over a synthetic set of facilities.
+
+Facilities are scattered over India, denser around a few metro areas, and
+each query result is checked against a brute-force scan.
+
+Usage (from backend/):
+    python -m benchmarks.bench_facility_lookup [--facilities 1000000] [--queries 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core.geo_index import FacilityIndex, haversine_km
+
+SPECIALTIES = ['Neurology', 'Cardiology', 'Emergency Medicine', 'Geriatrics', 'Memory Care',
+               'Internal Medicine', 'Neurosurgery', 'Trauma Care', "Alzheimer's Care", 'Cognitive Therapy',
+               'Ayurveda', 'Psychiatry']
+NAME_WORDS = ['City', 'Care', 'Life', 'Sunrise', 'Apollo', 'Shanti', 'Metro', 'Global', 'Sanjivani', 'Nova']
+METROS = [(19.07, 72.88), (28.61, 77.21), (12.97, 77.59), (22.31, 73.18), (13.08, 80.27), (22.57, 88.36)]
+
+
+def synthetic_facilities(n, seed=0):
+    rng = np.random.default_rng(seed)
+    metro = rng.random(n) < 0.6
+    centers = np.array(METROS)[rng.integers(0, len(METROS), n)]
+    lat = np.where(metro, centers[:, 0] + rng.normal(0, 0.3, n), rng.uniform(8, 35, n))
+    lng = np.where(metro, centers[:, 1] + rng.normal(0, 0.3, n), rng.uniform(68, 97, n))
+    picks = rng.integers(0, len(SPECIALTIES), (n, 3))
+    words = rng.integers(0, len(NAME_WORDS), (n, 2))
+    return pd.DataFrame({
+        'id': np.arange(n).astype(str),
+        'kind': np.where(rng.random(n) < 0.7, 'hospital', 'doctor'),
+        'name': [f"{NAME_WORDS[a]} {NAME_WORDS[b]} {'Hospital' if i % 3 else 'Clinic'} {i}"
+                 for i, (a, b) in enumerate(words.tolist())],
+        'address': '',
+        'phone': '',
+        'lat': lat,
+        'lng': lng,
+        'rating': np.round(rng.uniform(3, 5, n), 1),
+        'specialties': [';'.join(SPECIALTIES[j] for j in set(row)) for row in picks.tolist()],
+        'emergency': rng.random(n) < 0.3,
+        'hours': '24/7',
+    })
+
+
+def brute_matches(index, prefix):
+    """Every facility FacilityIndex.search(prefix) should find, by checking each one."""
+    first = prefix.split(' ', 1)[0]
+    return np.array([i for i in range(len(index)) if index._matches_words(i, prefix) and any(
+        token.startswith(first) for token in str(index._rows['name'][i]).lower().split()
+        + [s.lower() for s in index._rows['specialties'][i]])], dtype=np.int64)
+
+
+def timed(fn, args_list):
+    times = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1e3
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--facilities', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    facilities = synthetic_facilities(args.facilities)
+    start = time.perf_counter()
+    index = FacilityIndex(facilities)
+    print(f"{len(index)} facilities indexed in {time.perf_counter() - start:.1f}s")
+
+    rng = np.random.default_rng(1)
+    centers = np.array(METROS)[rng.integers(0, len(METROS), args.queries)]
+    points = list(zip((centers[:, 0] + rng.normal(0, 0.2, args.queries)).tolist(),
+                      (centers[:, 1] + rng.normal(0, 0.2, args.queries)).tolist()))
+
+    # Correctness against a brute-force scan on a sample of queries
+    for lat, lng in points[:50]:
+        fast = [r['id'] for r in index.nearest(lat, lng, 10, specialty='neuro')]
+        slow = [r['id'] for r in index._result(*index._top(*index._scan(lat, lng, index._filter_mask('neuro'), None), 10))]
+        assert fast == slow, (lat, lng)
+        fast = {r['id'] for r in index.within(lat, lng, 2.0, limit=10_000)}
+        slow = {r['id'] for r in index._result(*index._scan(lat, lng, None, None, 2.0))}
+        assert fast == slow, (lat, lng)
+    for prefix in ['c', 'car', 'neuro', 'city c']:
+        matches = brute_matches(index, prefix)
+        by_name = index._result(matches[np.argsort(index._name_rank[matches], kind='stable')][:10], None)
+        assert index.search(prefix, 10) == by_name, prefix
+        for lat, lng in points[:10]:
+            dist = haversine_km(lat, lng, index._lat[matches], index._lng[matches])
+            assert index.search(prefix, 10, lat, lng) == index._result(*index._top(matches, dist, 10)), (prefix, lat, lng)
+
+    cases = [
+        ('nearest 10', index.nearest, [(lat, lng, 10) for lat, lng in points]),
+        ('nearest 10, specialty', index.nearest, [(lat, lng, 10, 'memory care') for lat, lng in points]),
+        ('nearest 10, doctors', index.nearest, [(lat, lng, 10, None, 'doctor') for lat, lng in points]),
+        ('within 2 km, top 50', index.within, [(lat, lng, 2.0, 50) for lat, lng in points]),
+        ('prefix search', index.search, [(w[:3].lower(), 10) for w in np.random.default_rng(2).choice(NAME_WORDS, args.queries)]),
+        ('prefix search, located', index.search, [(w[:3].lower(), 10, lat, lng) for w, (lat, lng)
+                                                  in zip(np.random.default_rng(2).choice(NAME_WORDS, args.queries), points)]),
+    ]
+    for label, fn, arg_list in cases:
+        p50, p99 = timed(fn, arg_list)
+        print(f"{label:<24} p50 {p50:.3f} ms   p99 {p99:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Latency of /prakriti/predict's explanation mode next to the prediction itself.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prakriti_explain [--model model/prakriti_model_robust.pkl] [--requests 500]
+"""
+import argparse
+import os
+import time
+
+import joblib
+import pandas as pd
+
+from app.core.explain import ForestExplainer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LABEL_MAP = {0: 'Kapha', 1: 'Pitta', 2: 'Vata'}
+
+
+def per_call_ms(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=os.path.join(BACKEND_DIR, 'model', 'prakriti_model_robust.pkl'))
+    parser.add_argument('--encoder', default=os.path.join(BACKEND_DIR, 'model', 'prakriti_encoder.pkl'))
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    model, encoder = joblib.load(args.model), joblib.load(args.encoder)
+    answers = pd.read_csv(os.path.join(BACKEND_DIR, 'synthetic_data.csv')).drop(columns=['Dosha'])
+    sample = answers.head(args.requests).to_dict('records')
+
+    start = time.perf_counter()
+    explainer = ForestExplainer(model, encoder, LABEL_MAP)
+    print(f"explainer built in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    def predict(row):
+        encoded = pd.DataFrame(encoder.transform(pd.DataFrame([row])), columns=encoder.get_feature_names_out())
+        return model.predict_proba(encoded)
+
+    print(f"predict_proba:        {per_call_ms(predict, [(r,) for r in sample]):.3f} ms/request")
+    print(f"explain (cold cache): {per_call_ms(explainer.explain, [(r,) for r in sample]):.3f} ms/request")
+    print(f"explain (warm cache): {per_call_ms(explainer.explain, [(r,) for r in sample]):.3f} ms/request")
+
+    start = time.perf_counter()
+    explainer.explain_batch(answers)
+    elapsed = time.perf_counter() - start
+    print(f"explain_batch:        {len(answers)} rows in {elapsed:.2f} s ({len(answers) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Lets pytest import the `app` package from backend/ (pytest puts this directory on sys.path)
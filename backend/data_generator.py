@@ -0,0 +1,380 @@
+"""
+Vectorized synthetic data generator for Stage 1 and Stage 2.
+
+Samples whole columns at once from the same per-dosha distributions as
+``generate_data`` in Stage1.ipynb and the Stage 2 dataset cell in
+model/Stage2.ipynb, and streams fixed-size chunks to CSV or Parquet so
+memory stays bounded however many rows are requested. Risk labels come
+from the scoring tables in app.core.risk.
+
+Throughput: sampling reaches about 1M rows/s on one core (Stage 2) and
+more for Stage 1; writing is the bottleneck, so end-to-end output with
+pyarrow is closer to 0.5-0.75M rows/s (the rate printed includes it).
+
+Usage:
+    python data_generator.py stage1 1000000 stage1.csv --seed 42
+    python data_generator.py stage2 1000000 stage2.parquet --seed 42
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Labels use the API's own scoring rules, so the dataset can't drift from /predict_risk
+from app.core.risk import (ALLOPATHY_REC, AYURVEDA_REC, CATEGORY_POINTS, PRAKRITI_MULTIPLIER, RANGE_POINTS,
+                           RISK_LEVELS, VERDICTS, risk_level_codes)
+
+DOSHAS = ['Vata', 'Pitta', 'Kapha']
+DOSHA_P = [0.33, 0.33, 0.34]
+
+# Stage 1: per feature, for each dosha the main answer, its probability, and
+# the two fallback answers with their conditional probabilities.
+STAGE1_RULES = {
+    'Body_Frame': {
+        'Vata': ('Thin, light', 0.8, ['Medium, muscular', 'Heavy, broad'], [0.75, 0.25]),
+        'Pitta': ('Medium, muscular', 0.8, ['Thin, light', 'Heavy, broad'], [0.75, 0.25]),
+        'Kapha': ('Heavy, broad', 0.8, ['Thin, light', 'Medium, muscular'], [0.75, 0.25]),
+    },
+    'Skin_Texture': {
+        'Vata': ('Dry, rough, cold', 0.9, ['Warm, oily, reddish', 'Smooth, moist, thick'], [0.7, 0.3]),
+        'Pitta': ('Warm, oily, reddish', 0.9, ['Dry, rough, cold', 'Smooth, moist, thick'], [0.7, 0.3]),
+        'Kapha': ('Smooth, moist, thick', 0.9, ['Dry, rough, cold', 'Warm, oily, reddish'], [0.5, 0.5]),
+    },
+    'Hair_Type': {
+        'Vata': ('Dry, frizzy, brittle', 0.8, ['Soft, oily, reddish/brown', 'Thick, strong, oily'], [0.6, 0.4]),
+        'Pitta': ('Soft, oily, reddish/brown', 0.8, ['Thick, strong, oily', 'Dry, frizzy, brittle'], [0.7, 0.3]),
+        'Kapha': ('Thick, strong, oily', 0.8, ['Soft, oily, reddish/brown', 'Dry, frizzy, brittle'], [0.7, 0.3]),
+    },
+    'Eyes': {
+        'Vata': ('Small, dry, dull', 0.8, ['Sharp, intense, reddish', 'Large, calm, watery'], [0.75, 0.25]),
+        'Pitta': ('Sharp, intense, reddish', 0.8, ['Small, dry, dull', 'Large, calm, watery'], [0.75, 0.25]),
+        'Kapha': ('Large, calm, watery', 0.8, ['Small, dry, dull', 'Sharp, intense, reddish'], [0.75, 0.25]),
+    },
+    'Sleep_Pattern': {
+        'Vata': ('Light, interrupted', 0.8, ['Moderate', 'Deep, prolonged'], [0.75, 0.25]),
+        'Pitta': ('Moderate', 0.8, ['Light, interrupted', 'Deep, prolonged'], [0.75, 0.25]),
+        'Kapha': ('Deep, prolonged', 0.8, ['Light, interrupted', 'Moderate'], [0.75, 0.25]),
+    },
+    'Appetite': {
+        'Vata': ('Irregular', 0.85, ['Strong, frequent hunger', 'Slow, steady'], [0.67, 0.33]),
+        'Pitta': ('Strong, frequent hunger', 0.85, ['Irregular', 'Slow, steady'], [0.67, 0.33]),
+        'Kapha': ('Slow, steady', 0.85, ['Irregular', 'Strong, frequent hunger'], [0.67, 0.33]),
+    },
+    'Digestion': {
+        'Vata': ('Variable, bloating', 0.8, ['Fast, prone to acidity', 'Slow, sluggish'], [0.75, 0.25]),
+        'Pitta': ('Fast, prone to acidity', 0.8, ['Variable, bloating', 'Slow, sluggish'], [0.75, 0.25]),
+        'Kapha': ('Slow, sluggish', 0.8, ['Variable, bloating', 'Fast, prone to acidity'], [0.75, 0.25]),
+    },
+    'Sweating': {
+        'Vata': ('Less', 0.8, ['Profuse, with odor', 'Moderate, little odor'], [0.75, 0.25]),
+        'Pitta': ('Profuse, with odor', 0.8, ['Less', 'Moderate, little odor'], [0.75, 0.25]),
+        'Kapha': ('Moderate, little odor', 0.8, ['Less', 'Profuse, with odor'], [0.75, 0.25]),
+    },
+    'Speech_Voice': {
+        'Vata': ('Fast, low pitch', 0.8, ['Slow, melodious', 'Sharp, loud'], [0.7, 0.3]),
+        'Pitta': ('Sharp, loud', 0.85, ['Slow, melodious', 'Fast, low pitch'], [0.6, 0.4]),
+        'Kapha': ('Slow, melodious', 0.85, ['Fast, low pitch', 'Sharp, loud'], [0.6, 0.4]),
+    },
+    'Energy_Levels': {
+        'Vata': ('Variable, bursts of energy', 0.8, ['High but gets tired fast', 'Steady, consistent'], [0.75, 0.25]),
+        'Pitta': ('High but gets tired fast', 0.8, ['Variable, bursts of energy', 'Steady, consistent'], [0.75, 0.25]),
+        'Kapha': ('Steady, consistent', 0.8, ['Variable, bursts of energy', 'High but gets tired fast'], [0.75, 0.25]),
+    },
+    'Body_Temperature': {
+        'Vata': ('Cold', 0.8, ['Warm', 'Cool'], [0.75, 0.25]),
+        'Pitta': ('Warm', 0.8, ['Cold', 'Cool'], [0.75, 0.25]),
+        'Kapha': ('Cool', 0.8, ['Cold', 'Warm'], [0.75, 0.25]),
+    },
+    'Weather_Sensitivity': {
+        'Vata': ('Dislikes cold, wind', 0.8, ['Dislikes heat', 'Dislikes damp, cold'], [0.75, 0.25]),
+        'Pitta': ('Dislikes heat', 0.8, ['Dislikes cold, wind', 'Dislikes damp, cold'], [0.75, 0.25]),
+        'Kapha': ('Dislikes damp, cold', 0.8, ['Dislikes cold, wind', 'Dislikes heat'], [0.75, 0.25]),
+    },
+    'Memory': {
+        'Vata': ('Quick grasp, poor retention', 0.8, ['Sharp memory, good retention', 'Slow learning, excellent retention'], [0.75, 0.25]),
+        'Pitta': ('Sharp memory, good retention', 0.8, ['Quick grasp, poor retention', 'Slow learning, excellent retention'], [0.75, 0.25]),
+        'Kapha': ('Slow learning, excellent retention', 0.8, ['Quick grasp, poor retention', 'Sharp memory, good retention'], [0.75, 0.25]),
+    },
+    'Motion_Tendencies': {
+        'Vata': ('Restless, always moving', 0.8, ['Purposeful, active', 'Slow, steady'], [0.75, 0.25]),
+        'Pitta': ('Purposeful, active', 0.8, ['Restless, always moving', 'Slow, steady'], [0.75, 0.25]),
+        'Kapha': ('Slow, steady', 0.8, ['Restless, always moving', 'Purposeful, active'], [0.75, 0.25]),
+    },
+    'Mindset_Emotion': {
+        'Vata': ('Fear, anxiety', 0.8, ['Anger, irritability', 'Calm, possessive'], [0.75, 0.25]),
+        'Pitta': ('Anger, irritability', 0.8, ['Fear, anxiety', 'Calm, possessive'], [0.75, 0.25]),
+        'Kapha': ('Calm, possessive', 0.8, ['Fear, anxiety', 'Anger, irritability'], [0.75, 0.25]),
+    },
+    'Elimination_Stool': {
+        'Vata': ('Dry, hard, constipation', 0.8, ['Loose, frequent', 'Well-formed, slow'], [0.75, 0.25]),
+        'Pitta': ('Loose, frequent', 0.8, ['Dry, hard, constipation', 'Well-formed, slow'], [0.75, 0.25]),
+        'Kapha': ('Well-formed, slow', 0.8, ['Dry, hard, constipation', 'Loose, frequent'], [0.75, 0.25]),
+    },
+    'Sleep_Requirement': {
+        'Vata': ('4–6 hours', 0.8, ['6–7 hours', '8–10 hours'], [0.75, 0.25]),
+        'Pitta': ('6–7 hours', 0.8, ['4–6 hours', '8–10 hours'], [0.75, 0.25]),
+        'Kapha': ('8–10 hours', 0.8, ['4–6 hours', '6–7 hours'], [0.75, 0.25]),
+    },
+    'Hunger_Onset': {
+        'Vata': ('Irregular', 0.8, ['Sharp, quick hunger', 'Mild, slow hunger'], [0.75, 0.25]),
+        'Pitta': ('Sharp, quick hunger', 0.8, ['Irregular', 'Mild, slow hunger'], [0.75, 0.25]),
+        'Kapha': ('Mild, slow hunger', 0.8, ['Irregular', 'Sharp, quick hunger'], [0.75, 0.25]),
+    },
+    'Speech_Pace': {
+        'Vata': ('Fast', 0.8, ['Measured', 'Slow'], [0.75, 0.25]),
+        'Pitta': ('Measured', 0.8, ['Fast', 'Slow'], [0.75, 0.25]),
+        'Kapha': ('Slow', 0.8, ['Fast', 'Measured'], [0.75, 0.25]),
+    },
+    'Weight_Tendency': {
+        'Vata': ('Underweight', 0.8, ['Normal weight', 'Tendency to gain weight'], [0.75, 0.25]),
+        'Pitta': ('Normal weight', 0.8, ['Underweight', 'Tendency to gain weight'], [0.75, 0.25]),
+        'Kapha': ('Tendency to gain weight', 0.8, ['Underweight', 'Normal weight'], [0.75, 0.25]),
+    },
+}
+
+# Stage 2: option lists and weights from model/Stage2.ipynb
+GENDERS = ['Male', 'Female']
+DIET_TYPES = ['Balanced', 'Irregular', 'Junk']
+SLEEP_QUALITY = ['Good', 'Average', 'Poor']
+STRESS_LEVELS = ['Low', 'Medium', 'High']
+PHYSICAL_ACTIVITY = ['Active', 'Moderate', 'Sedentary']
+MEMORY_LOSS = ['None', 'Mild', 'Severe']
+CONFUSION = ['Rare', 'Sometimes', 'Often']
+LANGUAGE_DIFFICULTY = ['No', 'Mild', 'Yes']
+DECISION_MAKING = ['Sharp', 'Indecisive', 'Poor']
+REP_BEHAVIOR = ['No', 'Sometimes', 'Yes']
+SOCIAL_WITHDRAWAL = ['No', 'Sometimes', 'Yes']
+MOOD_SWINGS = ['No', 'Sometimes', 'Yes']
+CHRONIC_CONDITIONS = ['None', 'Diabetes', 'BP', 'Both']
+FAMILY_HISTORY = ['Yes', 'No']
+
+# (column, options, weights, maybe_flip probability)
+STAGE2_CATEGORICAL = [
+    ('gender', GENDERS, [1, 1], 0),
+    ('diet_type', DIET_TYPES, [40, 30, 30], 0.1),
+    ('sleep_quality', SLEEP_QUALITY, [40, 35, 25], 0.1),
+    ('stress_level', STRESS_LEVELS, [40, 35, 25], 0.1),
+    ('physical_activity', PHYSICAL_ACTIVITY, [35, 40, 25], 0.1),
+    ('memory_loss', MEMORY_LOSS, [60, 30, 10], 0.1),
+    ('confusion', CONFUSION, [60, 25, 15], 0.1),
+    ('language_difficulty', LANGUAGE_DIFFICULTY, [70, 20, 10], 0),
+    ('decision_making', DECISION_MAKING, [60, 25, 15], 0),
+    ('repetition_behavior', REP_BEHAVIOR, [70, 20, 10], 0),
+    ('social_withdrawal', SOCIAL_WITHDRAWAL, [70, 20, 10], 0),
+    ('mood_swings', MOOD_SWINGS, [70, 20, 10], 0),
+    ('chronic_conditions', CHRONIC_CONDITIONS, [40, 25, 25, 10], 0),
+    ('family_history', FAMILY_HISTORY, [1, 1], 0),
+]
+
+# Per-dosha ranges (Vata, Pitta, Kapha): randint bounds are inclusive
+SYSTOLIC_BP_RANGE = [(90, 130), (100, 140), (120, 160)]
+BLOOD_SUGAR_RANGE = [(70, 130), (80, 150), (90, 200)]
+BMI_RANGE = [(16, 24), (18, 28), (25, 35)]
+
+STAGE2_COLUMNS = [
+    'patient_id', 'prakriti_type', 'age', 'gender', 'diet_type', 'sleep_quality', 'stress_level',
+    'physical_activity', 'memory_loss', 'confusion', 'language_difficulty', 'decision_making',
+    'repetition_behavior', 'social_withdrawal', 'mood_swings', 'chronic_conditions', 'systolic_bp',
+    'blood_sugar', 'bmi', 'family_history', 'assessment_date', 'early_symptoms_score', 'risk_score',
+    'risk_level', 'verdict', 'ayurveda_recommendations', 'allopathy_recommendations',
+]
+
+def _stage1_tables():
+    """Per feature: sorted category list and a (dosha x category) cumulative probability table."""
+    tables = {}
+    for feature, rules in STAGE1_RULES.items():
+        categories = sorted({rules['Vata'][0], *rules['Vata'][2]})
+        probs = np.zeros((len(DOSHAS), len(categories)))
+        for d, dosha in enumerate(DOSHAS):
+            main, p_main, others, p_others = rules[dosha]
+            probs[d, categories.index(main)] += p_main
+            for other, p in zip(others, p_others):
+                probs[d, categories.index(other)] += (1 - p_main) * p
+        tables[feature] = (categories, np.cumsum(probs, axis=1)[:, :-1])
+    return tables
+
+
+STAGE1_TABLES = _stage1_tables()
+
+
+def _sample_codes(rng, cum, n):
+    """Draws category codes from cumulative probabilities (shared row or one row per sample)."""
+    u = rng.random(n)
+    codes = np.zeros(n, dtype=np.int8)
+    for k in range(cum.shape[-1]):
+        codes += u >= cum[..., k]
+    return codes
+
+
+def _maybe_flip(rng, codes, k, prob):
+    """Vectorized maybe_flip: swaps to one of the other k-1 options with probability prob."""
+    flip = rng.random(len(codes)) < prob
+    shift = rng.integers(1, k, size=len(codes))
+    return np.where(flip, (codes + shift) % k, codes).astype(np.int8)
+
+
+def generate_stage1_chunk(rng, n):
+    """Returns n Stage 1 rows as a DataFrame with categorical columns."""
+    dosha = _sample_codes(rng, np.cumsum(DOSHA_P)[:-1], n)
+    columns = {'Dosha': pd.Categorical.from_codes(dosha, DOSHAS)}
+    codes = {}
+    for feature, (categories, cum) in STAGE1_TABLES.items():
+        codes[feature] = _sample_codes(rng, cum[dosha], n)
+
+    # Correlated noise: dry skin pulls appetite towards 'Irregular'
+    skin_dry = STAGE1_TABLES['Skin_Texture'][0].index('Dry, rough, cold')
+    irregular = STAGE1_TABLES['Appetite'][0].index('Irregular')
+    override = (codes['Skin_Texture'] == skin_dry) & (rng.random(n) < 0.7)
+    codes['Appetite'][override] = irregular
+
+    for feature, (categories, _) in STAGE1_TABLES.items():
+        columns[feature] = pd.Categorical.from_codes(codes[feature], categories)
+    return pd.DataFrame(columns)
+
+
+def calculate_risk_scores(df):
+    """Vectorized app.core.risk.calculate_risk_score over a DataFrame of patient rows."""
+    score = np.zeros(len(df))
+    for column, values in CATEGORY_POINTS.items():
+        score += _column_points(df[column], values)
+    for column, (low, high, points) in RANGE_POINTS.items():
+        values = df[column].to_numpy()
+        outside = np.zeros(len(df), dtype=bool)
+        if low is not None:
+            outside |= values < low
+        if high is not None:
+            outside |= values > high
+        score += np.where(outside, points, 0)
+    score *= _column_points(df['prakriti_type'], PRAKRITI_MULTIPLIER, default=1.0)
+    score = np.minimum(score, 125)
+    return np.round(score / 125 * 100, 2)
+
+
+def _column_points(column, values, default=0.0):
+    """Looks up points per value, through the category codes when the column is categorical."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        table = np.array([values.get(c, default) for c in column.cat.categories] + [default])
+        return table[column.cat.codes.to_numpy()]
+    return column.map(values).fillna(default).to_numpy()
+
+
+def generate_stage2_chunk(rng, n, start=0, prakriti=None, today=None):
+    """
+    Returns n Stage 2 patient rows. prakriti may be an array of dosha codes
+    (index into DOSHAS) from Stage 1 predictions; otherwise it is sampled.
+    """
+    if prakriti is None:
+        prakriti = _sample_codes(rng, np.cumsum(DOSHA_P)[:-1], n)
+    prakriti = np.asarray(prakriti, dtype=np.int8)
+    today = today or date.today()
+
+    df = pd.DataFrame({
+        'patient_id': [f"PAT{i + 1000}" for i in range(start, start + n)],
+        'prakriti_type': pd.Categorical.from_codes(prakriti, DOSHAS),
+        'age': np.clip(np.trunc(rng.normal(60, 12, n)), 20, 90).astype(np.int16),
+    })
+    for column, options, weights, flip in STAGE2_CATEGORICAL:
+        cum = np.cumsum(np.array(weights) / sum(weights))[:-1]
+        codes = _sample_codes(rng, cum, n)
+        if flip:
+            codes = _maybe_flip(rng, codes, len(options), flip)
+        df[column] = pd.Categorical.from_codes(codes, options)
+
+    for column, ranges in (('systolic_bp', SYSTOLIC_BP_RANGE), ('blood_sugar', BLOOD_SUGAR_RANGE)):
+        low, high = np.array(ranges).T
+        df[column] = rng.integers(low[prakriti], high[prakriti] + 1).astype(np.int16)
+    low, high = np.array(BMI_RANGE).T
+    df['bmi'] = np.round(rng.uniform(low[prakriti], high[prakriti]), 1)
+
+    dates = [(today - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(1001)]
+    df['assessment_date'] = pd.Categorical.from_codes(rng.integers(0, 1001, size=n), dates)
+
+    symptoms = _column_points(df['memory_loss'], {'Mild': 10, 'Severe': 15})
+    symptoms += _column_points(df['confusion'], {'Sometimes': 5, 'Often': 8})
+    symptoms += _column_points(df['language_difficulty'], {'Mild': 3, 'Yes': 5})
+    symptoms += _column_points(df['decision_making'], {'Indecisive': 3, 'Poor': 5})
+    df['early_symptoms_score'] = symptoms.astype(np.int16)
+
+    score = calculate_risk_scores(df)
+    level = risk_level_codes(score)
+    df['risk_score'] = score
+    df['risk_level'] = pd.Categorical.from_codes(level, RISK_LEVELS)
+    df['verdict'] = pd.Categorical.from_codes(level, VERDICTS)
+    df['ayurveda_recommendations'] = pd.Categorical.from_codes(prakriti, [AYURVEDA_REC[d] for d in DOSHAS])
+    df['allopathy_recommendations'] = pd.Categorical.from_codes(level, [ALLOPATHY_REC[l] for l in RISK_LEVELS])
+    return df[STAGE2_COLUMNS]
+
+
+def iter_chunks(stage, num_rows, seed=None, chunk_size=250_000):
+    """Yields DataFrames of at most chunk_size rows; output depends only on seed and chunk_size."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_rows, chunk_size):
+        n = min(chunk_size, num_rows - start)
+        if stage == 'stage1':
+            yield generate_stage1_chunk(rng, n)
+        else:
+            yield generate_stage2_chunk(rng, n, start=start)
+
+
+def write_dataset(path, stage, num_rows, seed=None, chunk_size=250_000):
+    """
+    Streams a generated dataset to .csv or .parquet and returns the row count.
+    Uses pyarrow's writers when installed (Parquet requires it); CSV falls
+    back to pandas, which is roughly 10x slower.
+    """
+    chunks = iter_chunks(stage, num_rows, seed, chunk_size)
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError:
+        if path.endswith('.parquet'):
+            raise SystemExit("Writing Parquet requires pyarrow: pip install pyarrow")
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=(i == 0), index=False)
+        return num_rows
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if path.endswith('.parquet'):
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+            else:
+                # CSV has no dictionary type; decode categoricals to plain strings
+                table = pa.table({
+                    name: column.cast(pa.string()) if pa.types.is_dictionary(column.type) else column
+                    for name, column in zip(table.column_names, table.columns)
+                })
+                if writer is None:
+                    writer = pa_csv.CSVWriter(path, table.schema,
+                                              write_options=pa_csv.WriteOptions(quoting_style='needed'))
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return num_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Stage 1 / Stage 2 datasets.")
+    parser.add_argument('stage', choices=['stage1', 'stage2'])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output', help="Output path ending in .csv or .parquet")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_dataset(args.output, args.stage, args.rows, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.rows} {args.stage} rows to {args.output} in {elapsed:.2f}s "
+          f"({args.rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from app.core.admission import AdmissionController
+from app.core.security import create_access_token
+
+
+def _app(work_s, **limits):
+    app = FastAPI()
+    admission = AdmissionController("test", **limits)
+
+    @app.post("/work", dependencies=[Depends(admission)])
+    async def work():
+        await asyncio.sleep(work_s)
+        return {"ok": True}
+
+    return app, admission
+
+
+def _burst(app, n, tokens=(None,)):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+            async def one(i):
+                token = tokens[i % len(tokens)]
+                headers = {"Authorization": f"Bearer {token}"} if token else {}
+                return await client.post("/work", headers=headers)
+            return await asyncio.gather(*(one(i) for i in range(n)))
+    return [(r.status_code, r.headers.get("retry-after")) for r in asyncio.run(run())]
+
+
+def test_callers_over_their_rate_get_429():
+    app, admission = _app(0, rate=0.1, burst=3, anonymous_rate=0.1, anonymous_burst=6)
+    alice, bob = create_access_token({"sub": "alice"}), create_access_token({"sub": "bob"})
+    results = _burst(app, 8, tokens=[alice, bob])
+    assert [status for status, _ in results].count(200) == 6  # 3 each
+    assert all(retry and int(retry) >= 1 for status, retry in results if status == 429)
+    # Anonymous callers behind one address get their own, larger budget
+    assert [status for status, _ in _burst(app, 8)].count(200) == 6
+    assert admission.stats()['rate_limited'] == 4
+
+
+def test_saturated_endpoint_sheds_with_503():
+    app, admission = _app(0.05, burst=100, max_in_flight=2, max_queue=3, queue_timeout=5.0)
+    results = _burst(app, 10)
+    statuses = [status for status, _ in results]
+    assert statuses.count(200) == 5 and statuses.count(503) == 5
+    assert all(retry == "5" for status, retry in results if status == 503)
+    assert admission.stats() == {'in_flight': 0, 'waiting': 0, 'admitted': 5, 'queued': 3, 'rate_limited': 0,
+                                 'shed_queue_full': 5, 'shed_timeout': 0}
+
+
+def test_waiters_are_shed_after_the_queue_timeout():
+    app, admission = _app(0.3, burst=100, max_in_flight=1, max_queue=4, queue_timeout=0.05)
+    statuses = [status for status, _ in _burst(app, 5)]
+    assert statuses.count(200) == 1 and statuses.count(503) == 4
+    stats = admission.stats()
+    assert (stats['shed_timeout'], stats['in_flight'], stats['waiting']) == (4, 0, 0)
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.async_database import AsyncDatabaseManager
+from app.database import DatabaseManager
+from tests.test_codec import ANSWERS, PATIENT
+
+
+def _assessment(user_id, i):
+    return {
+        'user_id': user_id, 'cognitive_score': float(i), 'prakriti_type': 'Vata',
+        'prakriti_scores': {'Kapha': 20, 'Pitta': 30, 'Vata': 50}, 'risk_score': 40.0, 'risk_level': 'Low',
+        'raw_data': {**ANSWERS, **PATIENT, 'age': 40 + i},
+    }
+
+
+def test_concurrent_writes_and_reads(tmp_path):
+    path = str(tmp_path / 'async.db')
+
+    async def scenario():
+        db = AsyncDatabaseManager(path)
+        ids = await asyncio.gather(*(db.save_assessment(_assessment(i % 4 + 1, i)) for i in range(100)))
+        counts = await asyncio.gather(*(db.get_user_assessments(user_id) for user_id in (1, 2, 3, 4) * 5))
+        stored = await db.get_assessment(ids[7], 4)
+        await db.close()
+        return ids, counts, stored
+
+    ids, counts, stored = asyncio.run(scenario())
+    assert None not in ids and len(set(ids)) == 100
+    assert [len(rows) for rows in counts] == [25] * 20
+    assert stored['assessment_data']['age'] == 47
+    # Committed and visible to a separate connection
+    assert len(DatabaseManager(path).get_user_assessments(1)) == 25
+
+
+def test_worker_errors_reach_the_caller(tmp_path):
+    async def scenario():
+        db = AsyncDatabaseManager(str(tmp_path / 'async.db'))
+
+        def fail(*args):
+            raise RuntimeError('disk on fire')
+
+        db._db.get_user_assessments = fail
+        with pytest.raises(RuntimeError, match='disk on fire'):
+            await db.get_user_assessments(1)
+        # The worker survives the failure
+        assert await db.save_assessment(_assessment(1, 0)) is not None
+        await db.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_drains_queued_queries(tmp_path):
+    async def scenario():
+        db = AsyncDatabaseManager(str(tmp_path / 'async.db'))
+        pending = [asyncio.ensure_future(db.save_assessment(_assessment(1, i))) for i in range(20)]
+        await asyncio.sleep(0)
+        await db.close()
+        ids = await asyncio.gather(*pending)
+        return db, ids
+
+    db, ids = asyncio.run(scenario())
+    assert None not in ids
+    assert not db._thread.is_alive()
+    assert db._db._conn is None
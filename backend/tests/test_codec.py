@@ -0,0 +1,37 @@
+import pandas as pd
+
+from app.core import codec
+
+ANSWERS = pd.read_csv('synthetic_data.csv', nrows=1).drop(columns=['Dosha']).iloc[0].to_dict()
+PATIENT = {
+    'prakriti_type': 'Vata', 'age': 67, 'gender': 'Female', 'diet_type': 'Balanced', 'sleep_quality': 'Poor',
+    'stress_level': 'High', 'physical_activity': 'Sedentary', 'memory_loss': 'Mild', 'confusion': 'Rare',
+    'language_difficulty': 'No', 'decision_making': 'Sharp', 'repetition_behavior': 'No',
+    'social_withdrawal': 'Yes', 'mood_swings': 'No', 'chronic_conditions': 'None',
+    'systolic_bp': 142, 'blood_sugar': 118, 'bmi': 27.4, 'family_history': 'Yes',
+}
+
+
+def test_assessment_round_trip():
+    raw_data = {**ANSWERS, **PATIENT}
+    answers_packed, vitals_packed = codec.encode_assessment(raw_data)
+    assert codec.decode_assessment(answers_packed, vitals_packed) == raw_data
+
+
+def test_partial_assessment_round_trip():
+    patient = {k: v for k, v in PATIENT.items() if k not in ('bmi', 'gender')}
+    assert codec.decode_assessment(*codec.encode_assessment(patient)) == patient
+    assert codec.decode_assessment(*codec.encode_assessment(ANSWERS)) == ANSWERS
+
+
+def test_unrepresentable_values_fall_back_to_json():
+    assert codec.encode_assessment({**PATIENT, 'gender': 'Other'}) is None
+    assert codec.encode_assessment({**PATIENT, 'bmi': 27.45}) is None
+    assert codec.encode_assessment({**PATIENT, 'notes': 'free text'}) is None
+    assert codec.encode_assessment({}) is None
+
+
+def test_dosha_scores_round_trip():
+    scores = {'Kapha': 12, 'Pitta': 30, 'Vata': 58}
+    assert codec.unpack_dosha_scores(codec.pack_dosha_scores(scores)) == scores
+    assert codec.pack_dosha_scores({'Kapha': 12.5, 'Pitta': 30, 'Vata': 58}) is None
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.async_database import AsyncDatabaseManager
+from app.core.idempotency import IdempotencyRegistry
+from app.core.security import get_current_user
+from app.database import DatabaseManager
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # The router opens care_catalyst.db in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    from app.routers import assessment_router
+    path = str(tmp_path / 'history.db')
+    db = DatabaseManager(path)
+    monkeypatch.setattr(assessment_router, 'db_manager', db)
+    monkeypatch.setattr(assessment_router, 'idempotency', IdempotencyRegistry(db))
+    monkeypatch.setattr(assessment_router, 'assessments_db', AsyncDatabaseManager(path))
+    app = FastAPI()
+    app.include_router(assessment_router.router)
+    app.dependency_overrides[get_current_user] = lambda: {'id': 1, 'email': 'test@example.com'}
+    return TestClient(app)
+
+
+def test_history_etag_round_trip(client):
+    first = client.get('/assessment/history')
+    assert first.status_code == 200
+    etag = first.headers['etag']
+    assert first.headers['cache-control'] == 'private, no-cache'
+
+    cached = client.get('/assessment/history', headers={'If-None-Match': etag})
+    assert cached.status_code == 304 and cached.content == b''
+    assert cached.headers['etag'] == etag
+    # Weak comparison: the strong form of the same tag matches too
+    assert client.get('/assessment/history', headers={'If-None-Match': etag[2:]}).status_code == 304
+    assert client.get('/assessment/history', headers={'If-None-Match': 'W/"other"'}).status_code == 200
+
+
+def test_submit_shows_up_in_history_with_a_new_etag(client):
+    before = client.get('/assessment/history')
+    submitted = client.post('/assessment/submit', json={'question1': 'yes', 'question2': 'no'})
+    assert submitted.status_code == 200
+
+    after = client.get('/assessment/history', headers={'If-None-Match': before.headers['etag']})
+    assert after.status_code == 200
+    assert after.headers['etag'] != before.headers['etag']
+    history = after.json()
+    assert [a['id'] for a in history] == [submitted.json()['assessmentId']]
+    assert history[0]['assessment_data'] == {'question1': 'yes', 'question2': 'no'}
+    assert client.get('/assessment/history', headers={'If-None-Match': after.headers['etag']}).status_code == 304
@@ -0,0 +1,28 @@
+import pandas as pd
+
+import data_generator
+from app.core import risk
+
+
+def _chunk(seed, n=2000):
+    return next(data_generator.iter_chunks('stage2', n, seed=seed, chunk_size=n))
+
+
+def test_generated_labels_match_the_scalar_scorer():
+    chunk = _chunk(7)
+    for row in chunk.astype(object).to_dict('records'):
+        score = risk.calculate_risk_score(row)
+        assert row['risk_score'] == score
+        assert row['risk_level'] == risk.get_risk_level(score)
+        assert row['verdict'] == risk.get_verdict(score)
+        assert (row['ayurveda_recommendations'], row['allopathy_recommendations']) == \
+            risk.get_recommendations(row['prakriti_type'], row['risk_level'])
+
+
+def test_same_seed_gives_the_same_rows():
+    for stage in ('stage1', 'stage2'):
+        first = pd.concat(data_generator.iter_chunks(stage, 1500, seed=3, chunk_size=500))
+        second = pd.concat(data_generator.iter_chunks(stage, 1500, seed=3, chunk_size=500))
+        pd.testing.assert_frame_equal(first, second)
+        other = pd.concat(data_generator.iter_chunks(stage, 1500, seed=4, chunk_size=500))
+        assert not first.equals(other)
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.database import DatabaseManager
+from tests.test_codec import ANSWERS, PATIENT
+
+# Schema before packed storage (baseline app/database.py)
+LEGACY_SCHEMA = '''
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        age INTEGER,
+        phone TEXT,
+        gender TEXT,
+        is_admin BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE assessments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        cognitive_score REAL NOT NULL,
+        prakriti_type TEXT NOT NULL,
+        prakriti_scores TEXT NOT NULL,
+        risk_score REAL NOT NULL,
+        risk_level TEXT NOT NULL,
+        assessment_data TEXT NOT NULL,
+        ml_prediction TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    );
+    CREATE TABLE recommendations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        assessment_id INTEGER NOT NULL,
+        dietary_recommendations TEXT,
+        lifestyle_recommendations TEXT,
+        mental_wellness_recommendations TEXT,
+        preventive_care_recommendations TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (assessment_id) REFERENCES assessments (id) ON DELETE CASCADE
+    );
+'''
+
+SCORES = {'Kapha': 12, 'Pitta': 30, 'Vata': 58}
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO users (id, email, password_hash, first_name, last_name) VALUES (1, 'a@b.c', 'x', 'A', 'B')")
+    insert = ('INSERT INTO assessments (id, user_id, cognitive_score, prakriti_type, prakriti_scores, risk_score, '
+              'risk_level, assessment_data, ml_prediction) VALUES (?, 1, 7.5, ?, ?, 41.6, ?, ?, ?)')
+    conn.execute(insert, (1, 'Vata', json.dumps(SCORES), 'Medium', json.dumps({**ANSWERS, **PATIENT}), None))
+    conn.execute(insert, (2, 'Pitta', json.dumps(SCORES), 'Low', json.dumps({'notes': 'free text'}),
+                          json.dumps({'risk': 'Low'})))
+    conn.execute(insert, (3, 'Kapha', '{not json', 'High', json.dumps(PATIENT), None))
+    conn.execute('INSERT INTO recommendations (user_id, assessment_id) VALUES (1, 1)')
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_migration_packs_rows_and_keeps_foreign_keys(legacy_db):
+    db = DatabaseManager(legacy_db)
+
+    with db.get_connection() as conn:
+        schema = conn.execute("SELECT group_concat(sql, ' ') FROM sqlite_master").fetchone()[0]
+        assert 'assessments_json' not in schema and 'assessments_new' not in schema
+        assert conn.execute('PRAGMA foreign_key_check').fetchall() == []
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute('INSERT INTO recommendations (user_id, assessment_id) VALUES (1, 2)')
+        packed = conn.execute('SELECT answers_packed, vitals_packed, assessment_data FROM assessments WHERE id = 1').fetchone()
+        assert packed['answers_packed'] is not None and packed['assessment_data'] is None
+
+    assessments = {a['id']: a for a in db.get_user_assessments(1)}
+    assert assessments[1]['assessment_data'] == {**ANSWERS, **PATIENT}
+    assert assessments[1]['prakriti_scores'] == SCORES
+    assert assessments[2]['assessment_data'] == {'notes': 'free text'}
+    assert assessments[2]['ml_prediction'] == {'risk': 'Low'}
+    # Unreadable JSON survives verbatim instead of aborting the migration
+    assert assessments[3]['prakriti_scores'] == '{not json'
+    assert assessments[3]['assessment_data'] == PATIENT
+
+
+def test_failed_migration_leaves_legacy_table(legacy_db, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(DatabaseManager, '_pack_assessment_columns', staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        DatabaseManager(legacy_db)
+
+    conn = sqlite3.connect(legacy_db)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(assessments)')}
+    assert 'assessments_new' not in tables and 'answers_packed' not in columns
+    assert conn.execute('SELECT COUNT(*) FROM assessments').fetchone()[0] == 3
+    conn.close()
+
+    monkeypatch.undo()
+    assert len(DatabaseManager(legacy_db).get_user_assessments(1)) == 3
@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+
+from app.core.drift import DriftMonitor, _chi_square
+
+BASELINE = {'color': ['red'] * 600 + ['blue'] * 400, 'size': list(np.linspace(0, 100, 1000))}
+
+
+def _monitor(**kwargs):
+    return DriftMonitor(BASELINE, {'color': ['red', 'blue']}, ['size'], **kwargs)
+
+
+def _drain(monitor):
+    while monitor._queue.qsize():
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+
+def test_small_windows_are_not_scored():
+    monitor = _monitor(min_samples=100)
+    for _ in range(5):
+        monitor.observe({'color': 'green', 'size': 500})
+    _drain(monitor)
+    report = monitor.report()
+    assert report['drifted'] == []
+    assert report['features']['color']['status'] == 'insufficient_data'
+    assert report['features']['color']['psi'] is None
+
+
+def test_shifted_window_is_flagged():
+    monitor = _monitor(min_samples=100)
+    for i in range(200):
+        monitor.observe({'color': 'green' if i % 2 else 'red', 'size': 90 + i % 10})
+    _drain(monitor)
+    report = monitor.report()
+    assert set(report['drifted']) == {'color', 'size'}
+    assert report['features']['size']['p_value'] < 1e-6
+
+
+def test_matching_window_is_not_flagged():
+    monitor = _monitor(min_samples=100)
+    for i in range(1000):
+        monitor.observe({'color': BASELINE['color'][i], 'size': BASELINE['size'][i]})
+    _drain(monitor)
+    report = monitor.report()
+    assert report['drifted'] == []
+    assert report['features']['size']['psi'] < 0.01
+
+
+def test_chi_square_pools_sparse_bins():
+    # The last two bins expect < 5 observations each; pooled they expect 6
+    statistic, dof = _chi_square(np.array([50.0, 44.0, 3.0, 3.0]), np.array([50.0, 44.0, 3.0, 3.0]))
+    assert (statistic, dof) == (0.0, 2)
+    # Too few observations overall for any valid test
+    assert _chi_square(np.array([1.0, 1.0]), np.array([1.0, 1.0]))[1] == 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import OneHotEncoder
+
+from app.core.explain import ANSWER_FIELDS, ForestExplainer
+
+LABEL_MAP = {0: 'Kapha', 1: 'Pitta', 2: 'Vata'}
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    data = pd.read_csv('synthetic_data.csv', nrows=600)
+    answers = data[ANSWER_FIELDS]
+    encoder = OneHotEncoder(handle_unknown='ignore').fit(answers)
+    labels = data['Dosha'].map({v: k for k, v in LABEL_MAP.items()})
+    model = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0)
+    model.fit(encoder.transform(answers).toarray(), labels)
+    return model, encoder, answers.tail(50).reset_index(drop=True)
+
+
+def test_contributions_sum_to_predict_proba(fitted):
+    model, encoder, answers = fitted
+    explainer = ForestExplainer(model, encoder, LABEL_MAP)
+    X = encoder.transform(answers).toarray()
+    contrib = explainer.contributions(X)
+    np.testing.assert_allclose(explainer.base + contrib.sum(axis=1), model.predict_proba(X), atol=1e-9)
+
+
+def test_cache_hit_returns_the_same_explanation(fitted):
+    model, encoder, answers = fitted
+    explainer = ForestExplainer(model, encoder, LABEL_MAP)
+    row = answers.iloc[0].to_dict()
+    first = explainer.explain(row)
+    assert explainer.explain(dict(row)) == first
+    assert explainer._explain_packed.cache_info().hits == 1
+    # Partial answer sets bypass the cache but decompose the same way
+    partial = {k: v for k, v in row.items() if k != 'Memory'}
+    assert explainer.explain(partial)['Base_Score'] == first['Base_Score']
+    assert explainer._explain_packed.cache_info().hits == 1
+
+
+def test_batch_matches_single_rows(fitted):
+    model, encoder, answers = fitted
+    explainer = ForestExplainer(model, encoder, LABEL_MAP)
+    batch = explainer.explain_batch(answers)
+    np.testing.assert_allclose(batch, explainer.explain_batch(answers.to_dict('records')), atol=1e-12)
+    for i, row in enumerate(answers.head(10).to_dict('records')):
+        single = explainer.explain(row)['Contributions']
+        expected = {field: {d: round(float(c) * 100, 2) for d, c in zip(explainer.doshas, values)}
+                    for field, values in zip(ANSWER_FIELDS, batch[i])}
+        assert single == expected
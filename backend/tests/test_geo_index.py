@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from app.core.geo_index import FacilityIndex, haversine_km
+from benchmarks.bench_facility_lookup import synthetic_facilities
+
+POINTS = [(19.1, 72.9), (28.5, 77.3), (12.9, 77.6), (10.0, 95.0), (-30.0, 150.0)]
+
+
+@pytest.fixture(scope='module')
+def facilities():
+    return synthetic_facilities(20_000, seed=5)
+
+
+@pytest.fixture(scope='module')
+def records(facilities):
+    return [{**row, 'tokens': _tokens(row)} for row in facilities.to_dict('records')]
+
+
+@pytest.fixture(scope='module')
+def index(facilities):
+    return FacilityIndex(facilities)
+
+
+def _tokens(row):
+    return set(row['name'].lower().split()) | {s.strip().lower() for s in row['specialties'].split(';')}
+
+
+def _brute_search(records, prefix, limit, lat=None, lng=None):
+    first = prefix.split(' ', 1)[0]
+    hits = []
+    for row in records:
+        if not any(t.startswith(first) for t in row['tokens']):
+            continue
+        texts = [row['name'].lower()] + [s.strip().lower() for s in row['specialties'].split(';')]
+        if any((' ' + ' '.join(t.split())).find(' ' + prefix) >= 0 for t in texts):
+            hits.append(row)
+    if lat is None:
+        hits.sort(key=lambda row: row['name'].lower())
+    else:
+        dist = haversine_km(lat, lng, np.array([r['lat'] for r in hits]), np.array([r['lng'] for r in hits]))
+        hits = [hits[i] for i in np.argsort(dist, kind='stable')]
+    return [row['id'] for row in hits[:limit]]
+
+
+def _brute_nearest(facilities, lat, lng, limit, specialty=None, kind=None):
+    rows = facilities
+    if specialty:
+        rows = rows[rows['specialties'].str.lower().str.contains(specialty, regex=False)]
+    if kind:
+        rows = rows[rows['kind'] == kind]
+    dist = haversine_km(lat, lng, rows['lat'].to_numpy(), rows['lng'].to_numpy())
+    return rows['id'].to_numpy()[np.argsort(dist, kind='stable')][:limit].tolist()
+
+
+@pytest.mark.parametrize('prefix', ['c', 'ca', 'care', 'city c', 'neurology', 'memory care', 'clinic 1', 'zzz'])
+@pytest.mark.parametrize('located', [False, True])
+def test_search_matches_brute_force(records, index, prefix, located):
+    for lat, lng in POINTS[:3] if located else [(None, None)]:
+        fast = [r['id'] for r in index.search(prefix, 15, lat, lng)]
+        assert fast == _brute_search(records, prefix, 15, lat, lng)
+
+
+@pytest.mark.parametrize('specialty,kind', [(None, None), ('neuro', None), ('memory care', 'doctor'), (None, 'hospital')])
+def test_nearest_matches_brute_force(facilities, index, specialty, kind):
+    for lat, lng in POINTS:
+        fast = [r['id'] for r in index.nearest(lat, lng, 10, specialty=specialty, kind=kind, max_rings=4)]
+        assert fast == _brute_nearest(facilities, lat, lng, 10, specialty, kind)
+
+
+def test_unmatched_filters_return_nothing(index):
+    assert index.nearest(19.1, 72.9, 10, specialty='dermatology') == []
+    assert index.nearest(19.1, 72.9, 10, kind='pharmacy') == []
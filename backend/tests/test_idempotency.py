@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.idempotency import IdempotencyRegistry, request_fingerprint
+from app.database import DatabaseManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'idempotency.db')
+
+
+def test_duplicates_across_workers_compute_once(db_path):
+    # One registry per simulated worker process: they share only the database
+    workers = [IdempotencyRegistry(DatabaseManager(db_path)) for _ in range(4)]
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'assessment_id': len(calls)}
+
+    results = []
+    threads = [threading.Thread(target=lambda r=r: results.append(r.run('key-1', 'submit', {'a': 1}, compute)))
+               for r in workers for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{'assessment_id': 1}] * len(threads)
+
+
+def test_failed_compute_releases_claim(db_path):
+    registry = IdempotencyRegistry(DatabaseManager(db_path))
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        registry.run('key-1', 'submit', {'a': 1}, fail)
+    assert registry.run('key-1', 'submit', {'a': 1}, lambda: {'ok': True}) == {'ok': True}
+
+
+def test_expired_claim_is_taken_over(db_path):
+    db = DatabaseManager(db_path)
+    fingerprint = request_fingerprint({'a': 1})
+    assert db.claim_idempotency_key('key-1', 'submit', fingerprint, lease_seconds=0.1) is True
+    assert db.claim_idempotency_key('key-1', 'submit', fingerprint, lease_seconds=0.1) is False
+    # The owner never completes; the next request takes over once the lease runs out
+    registry = IdempotencyRegistry(db)
+    assert registry.run('key-1', 'submit', {'a': 1}, lambda: {'ok': True}) == {'ok': True}
+
+
+def test_key_reused_with_different_body(db_path):
+    registry = IdempotencyRegistry(DatabaseManager(db_path))
+    registry.run('key-1', 'submit', {'a': 1}, lambda: {'ok': True})
+    with pytest.raises(HTTPException) as exc:
+        registry.run('key-1', 'submit', {'a': 2}, lambda: {'ok': True})
+    assert exc.value.status_code == 422
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core import risk
+from app.core.idempotency import IdempotencyRegistry
+from app.core.percentile import PercentileIndex, SortedScores, age_band
+from app.database import DatabaseManager
+from tests.test_codec import PATIENT
+
+
+def _cohort(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'prakriti_type': rng.choice(['Vata', 'Pitta', 'Kapha'], n),
+        'age': rng.integers(30, 90, n),
+        'gender': rng.choice(['Male', 'Female'], n),
+        'risk_score': np.round(rng.uniform(0, 100, n)),  # whole numbers, so ties are common
+    })
+
+
+def _brute_force(cohort, patient, score):
+    band = age_band(patient['age'])
+    bands = cohort['age'].map(age_band)
+    groups = {
+        'overall': cohort,
+        'prakriti_type': cohort[cohort['prakriti_type'] == patient['prakriti_type']],
+        'age_band': cohort[bands == band],
+        'gender': cohort[cohort['gender'] == patient['gender']],
+        'cohort': cohort[(cohort['prakriti_type'] == patient['prakriti_type']) & (bands == band)
+                         & (cohort['gender'] == patient['gender'])],
+    }
+    result = {}
+    for name, group in groups.items():
+        scores = group['risk_score'].to_numpy()
+        if not len(scores):
+            result[name] = None
+            continue
+        result[name] = round(100 * (int((scores < score).sum()) + 0.5 * int((scores == score).sum())) / len(scores), 1)
+    return result
+
+
+def _check(index, cohort, seed):
+    for row in _cohort(30, seed).to_dict('records'):
+        assert index.percentiles(row, row['risk_score']) == _brute_force(cohort, row, row['risk_score'])
+
+
+def test_percentiles_match_brute_force_ranks():
+    cohort = _cohort(2000, 0)
+    index = PercentileIndex(cohort, merge_at=7)
+    _check(index, cohort, 1)
+
+    added = _cohort(300, 2)
+    for row in added.to_dict('records'):
+        index.add(row, row['risk_score'])
+    _check(index, pd.concat([cohort, added]), 3)
+
+
+def test_buffered_merges_match_a_full_rebuild():
+    cohort, added = _cohort(1000, 4), _cohort(500, 5)
+    index = PercentileIndex(cohort, merge_at=16)
+    for row in added.to_dict('records'):
+        index.add(row, row['risk_score'])
+    rebuilt = PercentileIndex(pd.concat([cohort, added]))
+    assert index._groups.keys() == rebuilt._groups.keys()
+    for key, group in index._groups.items():
+        group.merge()
+        np.testing.assert_array_equal(group.base, rebuilt._groups[key].base)
+
+    scores = SortedScores([3.0, 1.0, 2.0, 2.0])
+    for score in (2.0, 5.0, 2.0, 1.0):
+        scores.add(score, merge_at=100)
+    for score in (2.0, 2.0, 2.0, 5.0):
+        scores.remove(score, merge_at=100)
+    assert len(scores) == 4 and scores.rank(2.0) == (2, 1)
+    scores.merge()
+    np.testing.assert_array_equal(scores.base, [1.0, 1.0, 2.0, 3.0])
+
+
+def test_recorded_scores_are_capped():
+    cohort, added = _cohort(1000, 6), _cohort(400, 7)
+    index = PercentileIndex(cohort, merge_at=9, max_recorded=50)
+    for row in added.to_dict('records'):
+        index.add(row, row['risk_score'])
+    assert len(index) == 1050
+    _check(index, pd.concat([cohort, added.tail(50)]), 8)
+
+
+def test_replayed_requests_are_not_recorded_twice(tmp_path, monkeypatch):
+    monkeypatch.setattr(risk, 'percentile_index', PercentileIndex(_cohort(100, 9)))
+    registry = IdempotencyRegistry(DatabaseManager(str(tmp_path / 'replay.db')))
+    compute = lambda: risk.assess_risk(PATIENT, record=True)
+    first = registry.run('key-1', 'screening', PATIENT, compute)
+    assert registry.run('key-1', 'screening', PATIENT, compute) == first
+    assert len(risk.percentile_index) == 101
+    registry.run(None, 'screening', PATIENT, compute)
+    assert len(risk.percentile_index) == 102
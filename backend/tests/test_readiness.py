@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.codec import PRAKRITI_CATEGORIES, check_encoder_order
+from app.core.readiness import Readiness
+
+
+class _Encoder:
+    def __init__(self, categories):
+        self.feature_names_in_ = np.array(list(categories))
+        self.categories_ = [np.array(c, dtype=object) for c in categories.values()]
+
+
+def _client(readiness, database_ok=True):
+    # Same handler as app.main's /readyz, against a private Readiness
+    app = FastAPI()
+
+    @app.get("/readyz")
+    def readyz():
+        ready, body = readiness.report(database_ok)
+        return JSONResponse(body, status_code=200 if ready else 503)
+
+    return TestClient(app)
+
+
+def test_readyz_turns_ready_after_warm_up():
+    readiness = Readiness()
+    model = readiness.load('model', lambda: 'fitted model')
+    release = threading.Event()
+    readiness.add_warmup('model', lambda: release.wait(5))
+    client = _client(readiness)
+
+    assert model == 'fitted model'
+    assert client.get('/readyz').status_code == 503
+    thread = readiness.start_warm_up()
+    assert client.get('/readyz').json()['warmup']['started'] is True
+    assert client.get('/readyz').status_code == 503
+    release.set()
+    thread.join(5)
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    body = response.json()
+    assert body['status'] == 'ready'
+    assert body['models']['model']['loaded'] and body['models']['model']['warmed']
+    assert _client(readiness, database_ok=False).get('/readyz').status_code == 503
+
+
+def test_failed_loads_are_reported():
+    readiness = Readiness()
+
+    def missing_model():
+        raise FileNotFoundError('prakriti_model_robust.pkl')
+
+    def mismatched_encoder():
+        categories = {field: list(reversed(cats)) for field, cats in PRAKRITI_CATEGORIES.items()}
+        encoder = _Encoder(categories)
+        check_encoder_order(encoder)
+        return encoder
+
+    assert readiness.load('prakriti_model', missing_model) is None
+    assert readiness.load('prakriti_encoder', mismatched_encoder) is None
+    assert readiness.load('prakriti_ok', lambda: check_encoder_order(_Encoder(PRAKRITI_CATEGORIES)) or 'ok') == 'ok'
+    readiness.add_warmup('prakriti_model', lambda: 1 / 0)  # never runs: the model didn't load
+    readiness.warm_up()
+
+    response = _client(readiness).get('/readyz')
+    assert response.status_code == 503
+    models = response.json()['models']
+    assert models['prakriti_model']['error'] == 'load failed: prakriti_model_robust.pkl'
+    assert "do not match the answer codec" in models['prakriti_encoder']['error']
+    assert models['prakriti_ok']['error'] is None and models['prakriti_ok']['loaded']
+
+
+def test_failed_warm_up_keeps_the_worker_unready():
+    readiness = Readiness()
+    readiness.load('model', lambda: object())
+    readiness.add_warmup('model', lambda: 1 / 0)
+    readiness.warm_up()
+    body = _client(readiness).get('/readyz').json()
+    assert body['status'] == 'not ready'
+    assert body['models']['model']['error'].startswith('warm-up failed')
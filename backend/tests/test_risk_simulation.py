@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.core import risk
+from tests.test_codec import PATIENT
+
+
+def test_default_simulation_scores_every_combination():
+    result = risk.simulate_risk(PATIENT)
+    assert result['scenarios'] <= risk.MAX_SCENARIOS
+    assert result['baseline']['score'] == risk.calculate_risk_score(PATIENT)
+
+
+def test_empty_factor_list_is_rejected():
+    with pytest.raises(ValueError):
+        risk.simulate_risk(PATIENT, factors=[])
+
+
+def test_oversized_requests_are_rejected():
+    with pytest.raises(ValueError):
+        risk.simulate_risk(PATIENT, ['bmi'], {'bmi': list(range(risk.MAX_CANDIDATES_PER_FACTOR + 1))})
+    grid = {f: list(range(100, 100 + risk.MAX_CANDIDATES_PER_FACTOR)) for f in ('systolic_bp', 'blood_sugar', 'bmi')}
+    with pytest.raises(ValueError):
+        risk.simulate_risk(PATIENT, candidates=grid)  # 21^3 numeric values x the 4 categorical factors
+
+
+@pytest.mark.parametrize('prakriti', ['Vata', 'Kapha', 'Pitta'])
+def test_vectorized_scores_match_per_scenario_scoring(prakriti):
+    patient = {**PATIENT, 'prakriti_type': prakriti}
+    # Values on both sides of every rule threshold
+    candidates = {'systolic_bp': [139, 140, 141], 'blood_sugar': [129, 130, 131], 'bmi': [17.9, 18.0, 30.0, 30.1],
+                  'stress_level': ['Low', 'Medium', 'High'], 'sleep_quality': ['Good', 'Poor']}
+    factors = list(candidates)
+    result = risk.simulate_risk(patient, factors, candidates)
+
+    options = [risk._candidate_values(patient, f, candidates[f]) for f in factors]
+    scenarios = []
+    for index in itertools.product(*(range(len(values)) for values in options)):
+        scenario = {**patient, **{f: values[i] for f, values, i in zip(factors, options, index)}}
+        scenarios.append((index, sum(1 for i in index if i), risk.calculate_risk_score(scenario)))
+    assert result['scenarios'] == len(scenarios)
+    assert result['baseline'] == {'score': scenarios[0][2], 'level': risk.get_risk_level(scenarios[0][2])}
+
+    # Pareto front: best score per number of changes, kept only when it improves on fewer changes
+    expected, best = [], scenarios[0][2]
+    for k in range(1, len(factors) + 1):
+        score = min(s for _, changed, s in scenarios if changed == k)
+        if score < best:
+            best = score
+            expected.append(score)
+    assert [p['score'] for p in result['pareto']] == expected
+    for p in result['pareto']:
+        assert risk.calculate_risk_score({**patient, **p['changes']}) == p['score']
+        assert p['level'] == risk.get_risk_level(p['score'])
+
+    for axis, (factor, values) in enumerate(zip(factors, options)):
+        current = [s for index, _, s in scenarios if index[axis] == 0]
+        for i, value in enumerate(values[1:], start=1):
+            alone = risk.calculate_risk_score({**patient, factor: value}) - scenarios[0][2]
+            with_value = [s for index, _, s in scenarios if index[axis] == i]
+            effect = result['marginal'][factor][value]
+            assert effect['alone'] == round(alone, 2)
+            assert effect['average'] == pytest.approx(np.mean(with_value) - np.mean(current), abs=0.006)